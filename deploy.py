@@ -5,18 +5,34 @@ DailyYoutubeDigest - Deployment Script
 This script handles the deployment of the DailyYoutubeDigest application to AWS Lambda.
 """
 
+import base64
+import hashlib
 import json
 import logging
 import os
 import shutil
 import subprocess
 import sys
+import sysconfig
 import tempfile
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 import boto3
-from botocore.exceptions import ClientError
+from boto3.exceptions import Boto3Error
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+# zlib-ng is an optional SIMD-accelerated drop-in replacement for zlib
+try:
+    from zlib_ng import zlib_ng
+except ImportError:
+    zlib_ng = None
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +51,51 @@ SCHEDULE_EXPRESSION = os.getenv(
     "SCHEDULE_EXPRESSION", "cron(0 12 * * ? *)"
 )  # Daily at 12:00 UTC
 
+# Packages larger than this are uploaded to S3 instead of sent inline
+DEPLOYMENT_BUCKET = os.getenv("DEPLOYMENT_BUCKET")
+DEPLOYMENT_KEY = os.getenv(
+    "DEPLOYMENT_KEY", f"{LAMBDA_FUNCTION_NAME}/deployment_package.zip"
+)
+INLINE_PACKAGE_LIMIT = 6 * 1024 * 1024  # 6 MB
+
+# Local cache of built wheels for the requirements
+WHEELHOUSE_DIR = Path("wheelhouse")
+
+# Deployment package and the source hash it was built from
+PACKAGE_PATH = Path("deployment_package.zip")
+PACKAGE_HASH_PATH = Path("deployment_package.zip.sha256")
+
+# Tokenizer encodings bundled into the package, and the directory they are
+# cached in relative to the package root
+TIKTOKEN_ENCODINGS = ("o200k_base", "cl100k_base")
+TIKTOKEN_CACHE_DIR = "tiktoken_cache"
+
+# Source entries left out of the deployment package
+IGNORED_SOURCE_DIRS = {"__pycache__", "tests"}
+IGNORED_SOURCE_SUFFIXES = (".pyc", ".pyo")
+
+# Already-compressed files are stored as-is; everything else, including
+# native extensions, is deflated
+STORED_SUFFIXES = {".whl", ".png", ".zip"}
+DEFLATE_LEVEL = 6
+
+# Lambda deploys are submitted in batches to stay under control-plane limits
+DEPLOY_BATCH_SIZE = 10
+DEPLOY_BATCH_DELAY = 1.0  # seconds between batches
+
+# Retries for create_function while a new IAM role propagates to Lambda
+ROLE_PROPAGATION_RETRIES = 6
+
+# AWS clients, created once and shared by the deployment steps
+iam_client = boto3.client("iam", region_name=AWS_REGION)
+lambda_client = boto3.client(
+    "lambda",
+    region_name=AWS_REGION,
+    config=Config(retries={"max_attempts": 10, "mode": "adaptive"}),
+)
+events_client = boto3.client("events", region_name=AWS_REGION)
+s3_client = boto3.client("s3", region_name=AWS_REGION)
+
 
 def create_lambda_role():
     """
@@ -44,8 +105,6 @@ def create_lambda_role():
         str: The ARN of the created role or None if an error occurs
     """
     try:
-        iam_client = boto3.client("iam", region_name=AWS_REGION)
-
         # Check if the role already exists
         try:
             response = iam_client.get_role(RoleName=LAMBDA_ROLE_NAME)
@@ -88,15 +147,13 @@ def create_lambda_role():
             )
             logger.info(f"Attached policy {policy_arn} to role {LAMBDA_ROLE_NAME}")
 
-        # Wait for the role to be available
+        # Wait for the role to be available. Propagation to Lambda is handled
+        # by retrying create_function rather than a fixed sleep here.
         logger.info("Waiting for IAM role to be available...")
         waiter = iam_client.get_waiter("role_exists")
-        waiter.wait(RoleName=LAMBDA_ROLE_NAME)
-
-        # Additional delay to ensure the role is fully propagated
-        import time
-
-        time.sleep(10)
+        waiter.wait(
+            RoleName=LAMBDA_ROLE_NAME, WaiterConfig={"Delay": 1, "MaxAttempts": 10}
+        )
 
         return role_arn
 
@@ -105,44 +162,231 @@ def create_lambda_role():
         return None
 
 
+def build_wheelhouse(requirements_file):
+    """
+    Build wheels for the requirements into the local wheelhouse.
+
+    The wheelhouse is keyed by the SHA-256 of the requirements file, the
+    Python version and the platform, so wheels are only downloaded and built
+    again when one of them changes.
+
+    Args:
+        requirements_file (Path): Path to the requirements file
+
+    Returns:
+        Path: Path to the wheelhouse directory
+    """
+    digest = hashlib.sha256(requirements_file.read_bytes())
+    digest.update(sys.implementation.cache_tag.encode("utf-8"))
+    digest.update(sysconfig.get_platform().encode("utf-8"))
+    requirements_hash = digest.hexdigest()
+    hash_file = WHEELHOUSE_DIR / ".requirements.sha256"
+
+    if hash_file.exists() and hash_file.read_text().strip() == requirements_hash:
+        logger.info(f"Using cached wheelhouse: {WHEELHOUSE_DIR}")
+        return WHEELHOUSE_DIR
+
+    logger.info("Building wheelhouse...")
+    subprocess.check_call(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "wheel",
+            "-r",
+            str(requirements_file),
+            "-w",
+            str(WHEELHOUSE_DIR),
+        ]
+    )
+    hash_file.write_text(requirements_hash)
+
+    return WHEELHOUSE_DIR
+
+
+def iter_source_files(src_dir):
+    """
+    Yield the source files to package, in a stable order.
+
+    Args:
+        src_dir (Path): Source directory to walk
+
+    Yields:
+        Path: Path of each source file
+    """
+    for root, dirs, files in os.walk(src_dir, followlinks=False):
+        # Prune ignored directories in place so os.walk skips them
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_SOURCE_DIRS)
+
+        for file in sorted(files):
+            if not file.endswith(IGNORED_SOURCE_SUFFIXES):
+                yield Path(root) / file
+
+
+def compute_source_hash(src_dir, requirements_file):
+    """
+    Compute a SHA-256 over the source files and the requirements file.
+
+    Args:
+        src_dir (Path): Source directory
+        requirements_file (Path): Path to the requirements file
+
+    Returns:
+        str: Hex digest of the combined contents
+    """
+    digest = hashlib.sha256()
+
+    for path in iter_source_files(src_dir):
+        digest.update(str(path.relative_to(src_dir)).encode("utf-8"))
+        digest.update(path.read_bytes())
+
+    if requirements_file.exists():
+        digest.update(requirements_file.read_bytes())
+
+    return digest.hexdigest()
+
+
+def compute_package_sha256(package_path):
+    """
+    Compute the base64-encoded SHA-256 of a package, as Lambda reports it.
+
+    Args:
+        package_path (str): Path to the deployment package
+
+    Returns:
+        str: Base64-encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(package_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return base64.b64encode(digest.digest()).decode("ascii")
+
+
+@contextmanager
+def fast_deflate():
+    """Make zipfile use zlib-ng for DEFLATE and CRC-32 when it is installed."""
+    if zlib_ng is None:
+        yield
+        return
+
+    saved = zipfile.zlib, zipfile.crc32
+    zipfile.zlib, zipfile.crc32 = zlib_ng, zlib_ng.crc32
+    try:
+        yield
+    finally:
+        zipfile.zlib, zipfile.crc32 = saved
+
+
+def write_zip(zip_path, entries):
+    """
+    Write files into a ZIP archive, choosing the compression per file.
+
+    Args:
+        zip_path (Path): Path of the ZIP file to create
+        entries (list): List of (file path, archive name) tuples
+    """
+    with fast_deflate(), zipfile.ZipFile(zip_path, "w") as zipf:
+        for file_path, arcname in entries:
+            if file_path.suffix in STORED_SUFFIXES:
+                compress_type = zipfile.ZIP_STORED
+            else:
+                compress_type = zipfile.ZIP_DEFLATED
+
+            zipf.write(
+                file_path,
+                arcname,
+                compress_type=compress_type,
+                compresslevel=DEFLATE_LEVEL,
+            )
+
+
+def bundle_tiktoken_cache(target_dir):
+    """
+    Download the tokenizer files into the package so Lambda can load them
+    without network access.
+
+    The download runs with the tiktoken installed into the package, as the
+    deployment environment need not have it.
+
+    Args:
+        target_dir (str): Directory the package is assembled in
+
+    Returns:
+        bool: True if the files were bundled, False otherwise
+    """
+    cache_dir = os.path.join(target_dir, TIKTOKEN_CACHE_DIR)
+    logger.info(f"Bundling tokenizer files: {', '.join(TIKTOKEN_ENCODINGS)}")
+    try:
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-c",
+                "import sys, tiktoken\n"
+                "for name in sys.argv[1:]:\n"
+                "    tiktoken.get_encoding(name)",
+                *TIKTOKEN_ENCODINGS,
+            ],
+            env={
+                **os.environ,
+                "PYTHONPATH": target_dir,
+                "TIKTOKEN_CACHE_DIR": cache_dir,
+            },
+        )
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        # The function still runs, falling back to a character budget
+        logger.warning(f"Could not bundle tokenizer files: {str(e)}")
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return False
+
+
 def create_deployment_package():
     """
     Create a deployment package (ZIP file) for the Lambda function.
 
+    The existing package is reused when the source files and requirements
+    are unchanged since it was built.
+
     Returns:
         str: Path to the created ZIP file or None if an error occurs
     """
     try:
-        # Create a temporary directory
-        temp_dir = tempfile.mkdtemp()
-        logger.info(f"Created temporary directory: {temp_dir}")
-
-        # Copy the source code
         src_dir = Path("src")
         if not src_dir.exists():
             logger.error("Source directory not found")
             return None
 
-        # Copy source files
-        for item in src_dir.glob("**/*"):
-            if item.is_file():
-                # Create the destination directory if it doesn't exist
-                dest_dir = Path(temp_dir) / item.relative_to(src_dir).parent
-                dest_dir.mkdir(parents=True, exist_ok=True)
-
-                # Copy the file
-                shutil.copy2(item, dest_dir / item.name)
+        # Reuse the existing package if nothing has changed
+        requirements_file = Path("requirements.txt")
+        source_hash = compute_source_hash(src_dir, requirements_file)
+        if (
+            PACKAGE_PATH.exists()
+            and PACKAGE_HASH_PATH.exists()
+            and PACKAGE_HASH_PATH.read_text().strip() == source_hash
+        ):
+            logger.info(f"Sources unchanged, reusing package: {PACKAGE_PATH}")
+            return str(PACKAGE_PATH)
+
+        # Create a temporary directory for the dependencies
+        temp_dir = tempfile.mkdtemp()
+        logger.info(f"Created temporary directory: {temp_dir}")
 
         # Install dependencies
-        requirements_file = Path("requirements.txt")
         if requirements_file.exists():
-            logger.info("Installing dependencies...")
+            wheelhouse = build_wheelhouse(requirements_file)
+
+            logger.info("Installing dependencies from wheelhouse...")
             subprocess.check_call(
                 [
                     sys.executable,
                     "-m",
                     "pip",
                     "install",
+                    "--no-index",
+                    "--find-links",
+                    str(wheelhouse),
                     "-r",
                     str(requirements_file),
                     "-t",
@@ -150,75 +394,208 @@ def create_deployment_package():
                 ]
             )
 
-        # Create the ZIP file
-        zip_path = Path("deployment_package.zip")
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zipf.write(file_path, arcname)
+        tokenizer_bundled = bundle_tiktoken_cache(temp_dir)
+
+        # Create the ZIP file, adding source files straight from src/
+        entries = [
+            (path, str(path.relative_to(src_dir)))
+            for path in iter_source_files(src_dir)
+        ]
+        for root, _, files in os.walk(temp_dir):
+            for file in sorted(files):
+                file_path = Path(root) / file
+                entries.append((file_path, str(file_path.relative_to(temp_dir))))
+
+        write_zip(PACKAGE_PATH, entries)
 
-        logger.info(f"Created deployment package: {zip_path}")
+        # A package without the tokenizer files gets a hash that never matches,
+        # so the next deployment builds it again instead of reusing it
+        if not tokenizer_bundled:
+            source_hash += "-without-tokenizer"
+        PACKAGE_HASH_PATH.write_text(source_hash)
+        logger.info(f"Created deployment package: {PACKAGE_PATH}")
 
         # Clean up the temporary directory
         shutil.rmtree(temp_dir)
 
-        return str(zip_path)
+        return str(PACKAGE_PATH)
 
     except Exception as e:
         logger.error(f"Error creating deployment package: {str(e)}")
         return None
 
 
-def deploy_lambda_function(deployment_package, role_arn):
+def create_function_with_retry(**kwargs):
     """
-    Deploy the Lambda function.
+    Create a Lambda function, retrying while its IAM role is still propagating.
+
+    Args:
+        **kwargs: Arguments passed through to lambda_client.create_function
+
+    Returns:
+        dict: The create_function response
+    """
+    for attempt in range(ROLE_PROPAGATION_RETRIES):
+        try:
+            return lambda_client.create_function(**kwargs)
+        except lambda_client.exceptions.InvalidParameterValueException as e:
+            if "cannot be assumed by Lambda" not in str(e) or (
+                attempt == ROLE_PROPAGATION_RETRIES - 1
+            ):
+                raise
+
+            delay = min(2**attempt, 8)
+            logger.info(f"IAM role not yet assumable, retrying in {delay}s...")
+            time.sleep(delay)
+
+
+def upload_package_to_s3(deployment_package, code_sha256):
+    """
+    Upload the deployment package to the S3 deployment bucket.
+
+    The upload is skipped when the object in S3 was built from the same
+    package, as recorded in its metadata.
+
+    Args:
+        deployment_package (str): Path to the deployment package
+        code_sha256 (str): Base64-encoded SHA-256 of the deployment package
+
+    Returns:
+        tuple: (bucket, key) of the uploaded package
+    """
+    try:
+        head = s3_client.head_object(Bucket=DEPLOYMENT_BUCKET, Key=DEPLOYMENT_KEY)
+        if head["Metadata"].get("code-sha256") == code_sha256:
+            logger.info(f"Package already in S3: {DEPLOYMENT_BUCKET}/{DEPLOYMENT_KEY}")
+            return DEPLOYMENT_BUCKET, DEPLOYMENT_KEY
+    except ClientError as e:
+        if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+            raise
+
+    logger.info(f"Uploading package to S3: {DEPLOYMENT_BUCKET}/{DEPLOYMENT_KEY}")
+    s3_client.upload_file(
+        deployment_package,
+        DEPLOYMENT_BUCKET,
+        DEPLOYMENT_KEY,
+        ExtraArgs={"Metadata": {"code-sha256": code_sha256}},
+        Config=TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=8),
+    )
+
+    return DEPLOYMENT_BUCKET, DEPLOYMENT_KEY
+
+
+def get_package_code(deployment_package, code_sha256):
+    """
+    Build the Lambda code location for a deployment package.
+
+    Small packages are sent inline; larger ones go through S3 when a
+    deployment bucket is configured.
+
+    Args:
+        deployment_package (str): Path to the deployment package
+        code_sha256 (str): Base64-encoded SHA-256 of the deployment package
+
+    Returns:
+        dict: Either {"ZipFile": ...} or {"S3Bucket": ..., "S3Key": ...}
+    """
+    package_size = os.path.getsize(deployment_package)
+
+    if package_size >= INLINE_PACKAGE_LIMIT:
+        if DEPLOYMENT_BUCKET:
+            bucket, key = upload_package_to_s3(deployment_package, code_sha256)
+            return {"S3Bucket": bucket, "S3Key": key}
+
+        logger.warning(
+            f"Package is {package_size} bytes; set DEPLOYMENT_BUCKET to upload "
+            "it through S3 instead of inline"
+        )
+
+    with open(deployment_package, "rb") as f:
+        return {"ZipFile": f.read()}
+
+
+def lazy_package_code(deployment_package, code_sha256):
+    """
+    Defer building the code location until a function needs new code.
+
+    The returned function builds it on its first successful call and reuses
+    it afterwards, also across threads.
 
     Args:
         deployment_package (str): Path to the deployment package
+        code_sha256 (str): Base64-encoded SHA-256 of the deployment package
+
+    Returns:
+        callable: Function returning the code location from get_package_code
+    """
+    lock = threading.Lock()
+    code = {}
+
+    def get_code():
+        with lock:
+            if not code:
+                code.update(get_package_code(deployment_package, code_sha256))
+            return code
+
+    return get_code
+
+
+def deploy_function(function_name, get_code, code_sha256, role_arn):
+    """
+    Create or update a single Lambda function.
+
+    The package is only read, or uploaded to S3, when the function is created
+    or its deployed code differs.
+
+    Args:
+        function_name (str): Name of the Lambda function
+        get_code (callable): Function returning the code location
+        code_sha256 (str): Base64-encoded SHA-256 of the deployment package
         role_arn (str): ARN of the IAM role
 
     Returns:
         str: ARN of the Lambda function or None if an error occurs
     """
     try:
-        lambda_client = boto3.client("lambda", region_name=AWS_REGION)
-
         # Check if the function already exists
         try:
-            lambda_client.get_function(FunctionName=LAMBDA_FUNCTION_NAME)
-            function_exists = True
+            function = lambda_client.get_function(FunctionName=function_name)
         except lambda_client.exceptions.ResourceNotFoundException:
-            function_exists = False
+            function = None
 
-        # Read the deployment package
-        with open(deployment_package, "rb") as f:
-            zip_content = f.read()
+        if function:
+            response = function["Configuration"]
 
-        if function_exists:
-            # Update the existing function
-            logger.info(f"Updating Lambda function: {LAMBDA_FUNCTION_NAME}")
-            response = lambda_client.update_function_code(
-                FunctionName=LAMBDA_FUNCTION_NAME, ZipFile=zip_content
-            )
+            # Only upload the code if it differs from what is deployed
+            if response["CodeSha256"] == code_sha256:
+                logger.info(f"Lambda code unchanged: {function_name}")
+            else:
+                logger.info(f"Updating Lambda function: {function_name}")
+                response = lambda_client.update_function_code(
+                    FunctionName=function_name, **get_code()
+                )
+
+                # The configuration can't be changed while the code update runs
+                lambda_client.get_waiter("function_updated").wait(
+                    FunctionName=function_name
+                )
 
             # Update the function configuration
             lambda_client.update_function_configuration(
-                FunctionName=LAMBDA_FUNCTION_NAME,
+                FunctionName=function_name,
                 Timeout=LAMBDA_TIMEOUT,
                 MemorySize=LAMBDA_MEMORY_SIZE,
                 Environment={"Variables": {"PYTHONPATH": "/var/task"}},
             )
         else:
             # Create a new function
-            logger.info(f"Creating Lambda function: {LAMBDA_FUNCTION_NAME}")
-            response = lambda_client.create_function(
-                FunctionName=LAMBDA_FUNCTION_NAME,
+            logger.info(f"Creating Lambda function: {function_name}")
+            response = create_function_with_retry(
+                FunctionName=function_name,
                 Runtime="python3.9",
                 Role=role_arn,
                 Handler="main.lambda_handler",
-                Code={"ZipFile": zip_content},
+                Code=get_code(),
                 Timeout=LAMBDA_TIMEOUT,
                 MemorySize=LAMBDA_MEMORY_SIZE,
                 Environment={"Variables": {"PYTHONPATH": "/var/task"}},
@@ -229,11 +606,89 @@ def deploy_lambda_function(deployment_package, role_arn):
 
         return function_arn
 
-    except ClientError as e:
-        logger.error(f"Error deploying Lambda function: {str(e)}")
+    except (ClientError, BotoCoreError, Boto3Error, OSError) as e:
+        # BotoCoreError covers the WaiterError of a failed code update, and
+        # Boto3Error and OSError a failed package upload or read
+        logger.error(f"Error deploying Lambda function {function_name}: {str(e)}")
         return None
 
 
+def deploy_lambda_functions(function_names, deployment_package, role_arn):
+    """
+    Deploy a package to several Lambda functions in bounded batches.
+
+    Functions within a batch are deployed concurrently, with a short pause
+    between batches. Throttled calls are retried by the client's adaptive
+    retry mode.
+
+    Args:
+        function_names (list): Names of the Lambda functions
+        deployment_package (str): Path to the deployment package
+        role_arn (str): ARN of the IAM role
+
+    Returns:
+        dict: Mapping of function name to ARN (None for failed deploys)
+    """
+    try:
+        code_sha256 = compute_package_sha256(deployment_package)
+    except OSError as e:
+        logger.error(f"Error reading deployment package: {str(e)}")
+        return dict.fromkeys(function_names)
+
+    get_code = lazy_package_code(deployment_package, code_sha256)
+
+    function_arns = {}
+    with ThreadPoolExecutor(max_workers=DEPLOY_BATCH_SIZE) as executor:
+        for start in range(0, len(function_names), DEPLOY_BATCH_SIZE):
+            if start:
+                time.sleep(DEPLOY_BATCH_DELAY)
+
+            batch = function_names[start : start + DEPLOY_BATCH_SIZE]
+            arns = executor.map(
+                lambda name: deploy_function(name, get_code, code_sha256, role_arn),
+                batch,
+            )
+            function_arns.update(zip(batch, arns))
+
+    return function_arns
+
+
+def deploy_lambda_function(deployment_package, role_arn):
+    """
+    Deploy the Lambda function.
+
+    Args:
+        deployment_package (str): Path to the deployment package
+        role_arn (str): ARN of the IAM role
+
+    Returns:
+        str: ARN of the Lambda function or None if an error occurs
+    """
+    function_arns = deploy_lambda_functions(
+        [LAMBDA_FUNCTION_NAME], deployment_package, role_arn
+    )
+    return function_arns[LAMBDA_FUNCTION_NAME]
+
+
+def get_policy_statement_ids(function_name):
+    """
+    Get the statement IDs in a Lambda function's resource-based policy.
+
+    Args:
+        function_name (str): Name of the Lambda function
+
+    Returns:
+        set: Statement IDs, empty if the function has no policy yet
+    """
+    try:
+        response = lambda_client.get_policy(FunctionName=function_name)
+    except lambda_client.exceptions.ResourceNotFoundException:
+        return set()
+
+    policy = json.loads(response["Policy"])
+    return {statement["Sid"] for statement in policy["Statement"]}
+
+
 def create_event_rule(function_arn):
     """
     Create an EventBridge rule to trigger the Lambda function on a schedule.
@@ -245,9 +700,6 @@ def create_event_rule(function_arn):
         bool: True if successful, False otherwise
     """
     try:
-        events_client = boto3.client("events", region_name=AWS_REGION)
-        lambda_client = boto3.client("lambda", region_name=AWS_REGION)
-
         # Create the rule
         rule_name = f"{LAMBDA_FUNCTION_NAME}-schedule"
         logger.info(f"Creating EventBridge rule: {rule_name}")
@@ -261,18 +713,17 @@ def create_event_rule(function_arn):
 
         rule_arn = response["RuleArn"]
 
-        # Add permission for EventBridge to invoke the Lambda function
-        try:
+        # Add permission for EventBridge to invoke the Lambda function,
+        # unless an earlier deployment already added it
+        statement_id = f"{LAMBDA_FUNCTION_NAME}-event-permission"
+        if statement_id not in get_policy_statement_ids(LAMBDA_FUNCTION_NAME):
             lambda_client.add_permission(
                 FunctionName=LAMBDA_FUNCTION_NAME,
-                StatementId=f"{LAMBDA_FUNCTION_NAME}-event-permission",
+                StatementId=statement_id,
                 Action="lambda:InvokeFunction",
                 Principal="events.amazonaws.com",
                 SourceArn=rule_arn,
             )
-        except lambda_client.exceptions.ResourceConflictException:
-            # Permission already exists
-            pass
 
         # Create the target
         events_client.put_targets(
@@ -7,6 +7,7 @@ It orchestrates the process of fetching new videos from YouTube channels,
 generating summaries, and posting them to various platforms.
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -14,11 +15,22 @@ from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
 
-from src.services.openai_service import generate_summary
-from src.services.twitter_service import post_to_twitter
-from src.services.youtube_service import get_channel_videos, get_video_transcript
-from src.utils.config import load_config
-from src.utils.db import get_processed_videos, mark_video_as_processed
+from src.services.openai_service import (
+    DEFAULT_MODEL,
+    client as openai_client,
+    generate_summary,
+    generate_summary_and_tweet,
+    get_encoding,
+)
+from src.services.twitter_service import get_twitter_client, post_to_twitter
+from src.services.youtube_service import (
+    get_channel_videos_async,
+    get_uploads_playlist_ids,
+    get_video_transcript_async,
+    get_youtube_client,
+)
+from src.utils.config import load_config, refresh_config
+from src.utils.db import filter_unprocessed_async, mark_videos_as_processed_async
 
 # Configure logging
 logging.basicConfig(
@@ -30,9 +42,46 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Maximum number of concurrent requests to the Twitter API; OpenAI requests
+# are limited inside openai_service
+MAX_CONCURRENT_TWITTER_REQUESTS = 3
+
+# Reuse one event loop across warm Lambda invocations so the async clients'
+# pooled connections stay bound to a live loop
+_event_loop = asyncio.new_event_loop()
+
+# Load the configuration once per container
+config = load_config()
+
+
+def warm_up():
+    """Build API clients and open connections ahead of the first invocation."""
+    try:
+        get_youtube_client()
+        get_twitter_client()
+        get_encoding(DEFAULT_MODEL)
+
+        # Resolve DNS and complete the TLS handshake with the OpenAI API
+        _event_loop.run_until_complete(openai_client.models.list())
+
+        logger.info("Warm-up completed")
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {str(e)}")
+
+
+# Provisioned-concurrency environments are initialized before any traffic
+# arrives, so do the client setup there instead of in the first invocation
+if os.getenv("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+    warm_up()
+
+
+async def process_video(video, channel_config, global_settings, twitter_semaphore):
+    """
+    Process a single video by generating a summary and posting it.
 
-def process_video(video, channel_config):
-    """Process a single video by generating a summary and posting it."""
+    Returns:
+        dict: The processed video record to store, or None if processing failed
+    """
     video_id = video["id"]["videoId"]
     video_title = video["snippet"]["title"]
     channel_name = video["snippet"]["channelTitle"]
@@ -40,42 +89,61 @@ def process_video(video, channel_config):
     logger.info(f"Processing video: {video_title} ({video_id})")
 
     # Get video transcript
-    transcript = get_video_transcript(video_id)
+    transcript = await get_video_transcript_async(video_id)
     if not transcript:
         logger.warning(f"Could not get transcript for video {video_id}")
-        return False
+        return None
 
     # Generate summary
     summary_style = channel_config.get(
-        "summary_style", config["global_settings"]["default_summary_style"]
+        "summary_style", global_settings["default_summary_style"]
     )
     summary_length = channel_config.get(
-        "summary_length", config["global_settings"]["default_summary_length"]
+        "summary_length", global_settings["default_summary_length"]
     )
     include_timestamps = channel_config.get(
-        "include_timestamps", config["global_settings"]["default_include_timestamps"]
+        "include_timestamps", global_settings["default_include_timestamps"]
     )
 
-    summary = generate_summary(
-        transcript,
-        style=summary_style,
-        max_length=summary_length,
-        include_timestamps=include_timestamps,
-        video_title=video_title,
-        channel_name=channel_name,
-    )
-
-    print("SUMMARY", summary)
-
-    return True
+    model = global_settings.get("openai_model", DEFAULT_MODEL)
+
+    post_tweet = channel_config.get("post_to_twitter", False)
+
+    # Generate the tweet in the same request when it will be posted
+    tweet = None
+    if post_tweet:
+        result = await generate_summary_and_tweet(
+            transcript,
+            video_id,
+            style=summary_style,
+            max_length=summary_length,
+            include_timestamps=include_timestamps,
+            video_title=video_title,
+            channel_name=channel_name,
+            model=model,
+        )
+        summary, tweet = result or (None, None)
+    else:
+        summary = await generate_summary(
+            transcript,
+            style=summary_style,
+            max_length=summary_length,
+            include_timestamps=include_timestamps,
+            video_title=video_title,
+            channel_name=channel_name,
+            model=model,
+        )
 
     if not summary:
         logger.warning(f"Could not generate summary for video {video_id}")
-        return False
+        return None
 
     # Post to Twitter if configured
-    if channel_config.get("post_to_twitter", False):
-        twitter_success = post_to_twitter(summary, video_id, video_title, channel_name)
+    if post_tweet:
+        async with twitter_semaphore:
+            twitter_success = await post_to_twitter(
+                summary, video_id, video_title, channel_name, tweet_content=tweet
+            )
         if not twitter_success:
             logger.warning(f"Failed to post to Twitter for video {video_id}")
 
@@ -84,17 +152,14 @@ def process_video(video, channel_config):
         # Placeholder for blog posting functionality
         logger.info(f"Would post to blog for video {video_id}")
 
-    # Mark video as processed
-    mark_video_as_processed(video_id, channel_name, summary)
-
     logger.info(f"Successfully processed video {video_id}")
-    return True
+    return {"video_id": video_id, "channel_name": channel_name, "summary": summary}
 
 
 def lambda_handler(event, context):
     """AWS Lambda handler function."""
     try:
-        main()
+        _event_loop.run_until_complete(main())
         return {
             "statusCode": 200,
             "body": json.dumps({"message": "Processing completed successfully"}),
@@ -104,51 +169,86 @@ def lambda_handler(event, context):
         return {"statusCode": 500, "body": json.dumps({"message": f"Error: {str(e)}"})}
 
 
-def main():
+async def main():
     """Main function to process videos from all configured channels."""
-    global config
-    config = load_config()
-
-    # Get list of already processed videos
-    processed_videos = get_processed_videos()
+    # Pick up configuration changes made since the container started
+    config = await asyncio.to_thread(refresh_config)
+    global_settings = config["global_settings"]
 
     # Calculate the date to look back for new videos
-    days_to_look_back = config["global_settings"].get("days_to_look_back", 1)
+    days_to_look_back = global_settings.get("days_to_look_back", 1)
     published_after = (
         datetime.utcnow() - timedelta(days=days_to_look_back)
     ).isoformat() + "Z"
 
-    # Process each channel
-    for channel in config["channels"]:
-        channel_id = channel["channel_id"]
-        channel_name = channel["name"]
-
-        logger.info(f"Processing channel: {channel_name}")
+    # Resolve the uploads playlists of all channels in one batched lookup
+    await asyncio.to_thread(
+        get_uploads_playlist_ids,
+        [channel["channel_id"] for channel in config["channels"]],
+    )
 
-        # Get recent videos from the channel
-        videos = get_channel_videos(
-            channel_id,
-            max_results=config["global_settings"].get("max_videos_per_channel", 3),
-            published_after=published_after,
+    # Fetch recent videos from all channels concurrently
+    channel_videos = await asyncio.gather(
+        *(
+            get_channel_videos_async(
+                channel["channel_id"],
+                max_results=global_settings.get("max_videos_per_channel", 3),
+                published_after=published_after,
+            )
+            for channel in config["channels"]
         )
+    )
 
+    # Look up only the fetched videos among the already processed ones
+    unprocessed_videos = await filter_unprocessed_async(
+        [video["id"]["videoId"] for videos in channel_videos for video in videos or []],
+    )
+
+    # Process the new videos of all channels concurrently, limiting in-flight
+    # Twitter requests
+    twitter_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TWITTER_REQUESTS)
+    tasks = []
+    for channel, videos in zip(config["channels"], channel_videos):
         if not videos:
-            logger.info(f"No new videos found for channel {channel_name}")
+            logger.info(f"No new videos found for channel {channel['name']}")
             continue
 
-        # Process each video
         for video in videos:
             video_id = video["id"]["videoId"]
 
             # Skip if already processed
-            if video_id in processed_videos:
+            if video_id not in unprocessed_videos:
                 logger.info(f"Video {video_id} already processed, skipping")
                 continue
 
-            process_video(video, channel)
-
-            break
+            tasks.append(
+                asyncio.create_task(
+                    process_video(
+                        video,
+                        channel,
+                        global_settings,
+                        twitter_semaphore,
+                    )
+                )
+            )
+
+    # Mark videos as processed as soon as they finish, batching those that
+    # finish together, so a run cut short by the Lambda timeout does not
+    # post them again. One failing video must not cancel the others.
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        records = []
+        for task in done:
+            if task.exception():
+                logger.error(f"Error processing video: {str(task.exception())}")
+            elif task.result():
+                records.append(task.result())
+
+        if records:
+            await mark_videos_as_processed_async(records)
 
 
 if __name__ == "__main__":
-    main()
+    _event_loop.run_until_complete(main())
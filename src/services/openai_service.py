@@ -4,31 +4,339 @@ OpenAI Service
 This module handles interactions with the OpenAI API for generating summaries.
 """
 
+import asyncio
+import json
 import logging
 import os
+from functools import lru_cache
+from io import StringIO
 
-from openai import OpenAI
+import tiktoken
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from src.services.prompts import (
+    SUMMARY_AND_TWEET_SYSTEM_PROMPT,
+    SUMMARY_SYSTEM_PROMPT,
+    TWEET_SYSTEM_PROMPT,
+)
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Tokenizer files shipped in the deployment package, so the encoding loads
+# without downloading it from the network on every cold start
+BUNDLED_TIKTOKEN_CACHE_DIR = os.path.join(
+    os.getenv("LAMBDA_TASK_ROOT", os.getcwd()), "tiktoken_cache"
+)
+if os.path.isdir(BUNDLED_TIKTOKEN_CACHE_DIR):
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", BUNDLED_TIKTOKEN_CACHE_DIR)
+
 # Get OpenAI API key from environment variables
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+# Model used for summaries and tweets unless the caller picks another
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Transcripts up to this many tokens are summarized in a single request
+MAX_TRANSCRIPT_TOKENS = 100_000
+
+# Longer transcripts are split into chunks of this many tokens, which are
+# summarized concurrently before the final summary is generated
+TRANSCRIPT_CHUNK_TOKENS = 8_000
+
+# Model used to summarize individual transcript chunks
+CHUNK_SUMMARY_MODEL = "gpt-4o-mini"
+
+# Approximate characters per token, used to budget transcripts when no
+# tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Maximum number of concurrent requests to the OpenAI API
+MAX_CONCURRENT_REQUESTS = 8
+
+# Output tokens allowed per word of summary, with headroom for punctuation
+# and timestamps
+SUMMARY_TOKENS_PER_WORD = 2
+
+# Output tokens reserved for the tweet and the JSON wrapper of a combined
+# summary and tweet response
+TWEET_TOKEN_BUDGET = 200
+
+# Semaphore limiting in-flight requests, bound to the event loop it was
+# created in
+_request_semaphore = None
+_request_semaphore_loop = None
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(model):
+    """Load the tiktoken encoding for a model, caching only successful loads."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def get_encoding(model):
+    """
+    Return the tiktoken encoding for a model, loading it once per model.
+
+    A failed load is not cached, so the next call tries again.
+
+    Args:
+        model (str): The OpenAI model name
+
+    Returns:
+        tiktoken.Encoding: The encoding or None if it could not be loaded
+    """
+    try:
+        return _load_encoding(model)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}: {str(e)}")
+        return None
+
+
+def split_transcript(transcript, model):
+    """
+    Split a transcript into chunks that fit a single summary request.
+
+    Counts tokens with the model's encoding, or approximates them from the
+    character count when the encoding is not available.
+
+    Args:
+        transcript (str): The video transcript text
+        model (str): The OpenAI model used for the final summary
+
+    Returns:
+        list: The transcript itself if it fits MAX_TRANSCRIPT_TOKENS,
+            otherwise chunks of about TRANSCRIPT_CHUNK_TOKENS tokens
+    """
+    encoding = get_encoding(model)
+
+    if encoding is None:
+        if len(transcript) <= MAX_TRANSCRIPT_TOKENS * CHARS_PER_TOKEN:
+            return [transcript]
+        chunk_chars = TRANSCRIPT_CHUNK_TOKENS * CHARS_PER_TOKEN
+        return [
+            transcript[start : start + chunk_chars]
+            for start in range(0, len(transcript), chunk_chars)
+        ]
+
+    # Transcripts are plain text, so strings such as <|endoftext|> are
+    # encoded as text instead of raising
+    tokens = encoding.encode(transcript, disallowed_special=())
+    if len(tokens) <= MAX_TRANSCRIPT_TOKENS:
+        return [transcript]
+
+    return [
+        encoding.decode(tokens[start : start + TRANSCRIPT_CHUNK_TOKENS])
+        for start in range(0, len(tokens), TRANSCRIPT_CHUNK_TOKENS)
+    ]
+
+
+def _get_request_semaphore():
+    """Return the request semaphore of the running event loop."""
+    global _request_semaphore, _request_semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _request_semaphore is None or _request_semaphore_loop is not loop:
+        _request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _request_semaphore_loop = loop
+
+    return _request_semaphore
+
+
+async def create_completion(**kwargs):
+    """
+    Stream a chat completion and return its text once it is complete.
+
+    At most MAX_CONCURRENT_REQUESTS completions run at the same time.
+
+    Args:
+        **kwargs: Arguments passed to client.chat.completions.create
+
+    Returns:
+        tuple: (generated text, finish reason), where a finish reason of
+            "length" means the text was cut off at max_tokens
+    """
+    buffer = StringIO()
+    finish_reason = None
+
+    async with _get_request_semaphore():
+        response = await client.chat.completions.create(stream=True, **kwargs)
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].delta.content:
+                buffer.write(chunk.choices[0].delta.content)
+            if chunk.choices[0].finish_reason:
+                finish_reason = chunk.choices[0].finish_reason
+
+    return buffer.getvalue(), finish_reason
+
+
+async def summarize_chunk(chunk, part, total_parts):
+    """
+    Summarize one chunk of a long transcript.
+
+    Args:
+        chunk (str): The transcript chunk text
+        part (int): The 1-based position of the chunk
+        total_parts (int): The total number of chunks
+
+    Returns:
+        str: Summary of the chunk or None if an error occurs
+    """
+    try:
+        content, _ = await create_completion(
+            model=CHUNK_SUMMARY_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that summarizes sections of YouTube video transcripts accurately and concisely.",
+                },
+                {
+                    "role": "user",
+                    "content": f"Summarize part {part} of {total_parts} of a YouTube video transcript. Keep every key point, name and figure.\n\nTRANSCRIPT:\n{chunk}",
+                },
+            ],
+            temperature=0.3,
+            max_tokens=1000,
+        )
+
+        return content.strip()
+
+    except Exception as e:
+        logger.error(f"Error summarizing transcript part {part}: {str(e)}")
+        return None
+
+
+async def condense_transcript(transcript, model):
+    """
+    Fit a transcript into the token budget of a single summary request.
+
+    Transcripts within MAX_TRANSCRIPT_TOKENS are returned unchanged. Longer
+    ones are split into chunks that are summarized concurrently, and the
+    joined chunk summaries are returned instead.
+
+    Args:
+        transcript (str): The video transcript text
+        model (str): The OpenAI model used for the final summary
+
+    Returns:
+        str: Transcript text to summarize or None if an error occurs
+    """
+    chunks = split_transcript(transcript, model)
+    if len(chunks) == 1:
+        return transcript
+
+    logger.info(f"Transcript is too long, summarizing in {len(chunks)} parts")
+
+    summaries = await asyncio.gather(
+        *(
+            summarize_chunk(chunk, part, len(chunks))
+            for part, chunk in enumerate(chunks, start=1)
+        )
+    )
+
+    if not all(summaries):
+        logger.error("Failed to summarize all transcript parts")
+        return None
+
+    return "\n\n".join(summaries)
+
+
+def build_summary_prompt(
+    transcript, style, max_length, include_timestamps, video_title, channel_name
+):
+    """
+    Build the user prompt for summarizing a video transcript.
+
+    The summary guidelines live in SUMMARY_SYSTEM_PROMPT, so the prompt only
+    carries the settings of this request followed by the transcript.
+
+    Args:
+        transcript (str): The video transcript text
+        style (str): Summary style - "concise", "detailed", or "bullet_points"
+        max_length (int): Maximum length of the summary in words
+        include_timestamps (bool): Whether to include timestamps in the summary
+        video_title (str): The title of the video
+        channel_name (str): The name of the YouTube channel
+
+    Returns:
+        str: The prompt text
+    """
+    settings = [
+        f"Style: {style}",
+        f"Maximum length: {max_length} words",
+        f"Timestamps: {'yes' if include_timestamps else 'no'}",
+    ]
+
+    # Add video title and channel name to the prompt if available
+    if video_title and channel_name:
+        settings.append(f"Title: {video_title}")
+        settings.append(f"Channel: {channel_name}")
+
+    return "\n".join(settings) + f"\n\nTRANSCRIPT:\n{transcript}"
+
+
+def get_tweet_layout(video_id, channel_name, max_length):
+    """
+    Work out the fixed parts of a tweet and the space left for its text.
 
+    Args:
+        video_id (str): The YouTube video ID
+        channel_name (str): The name of the YouTube channel
+        max_length (int): Maximum length of the tweet
+
+    Returns:
+        tuple: (video URL, attribution, available length for the text)
+    """
+    # Calculate the length of the video URL and attribution
+    video_url = f"https://youtu.be/{video_id}"
+    attribution = f" - {channel_name}"
 
-def generate_summary(
+    # Calculate the available length for the summary
+    # Account for spaces between components and a buffer
+    available_length = max_length - len(video_url) - len(attribution) - 3
+
+    return video_url, attribution, available_length
+
+
+def format_tweet(tweet_content, video_url, attribution, available_length):
+    """
+    Trim tweet text to the available length and append the URL and attribution.
+
+    Args:
+        tweet_content (str): The generated tweet text
+        video_url (str): The video URL
+        attribution (str): The channel attribution
+        available_length (int): Maximum length of the tweet text
+
+    Returns:
+        str: The full tweet
+    """
+    # Ensure the tweet is within the length limit
+    if len(tweet_content) > available_length:
+        tweet_content = tweet_content[: available_length - 3] + "..."
+
+    # Combine with the video URL and attribution
+    return f"{tweet_content} {video_url}{attribution}"
+
+
+async def generate_summary(
     transcript,
     style="concise",
     max_length=500,
     include_timestamps=True,
     video_title=None,
     channel_name=None,
-    model="gpt-4o",
+    model=DEFAULT_MODEL,
 ):
     """
     Generate a summary of a YouTube video transcript using OpenAI's API.
@@ -54,54 +362,162 @@ def generate_summary(
         return None
 
     try:
-        # Prepare the prompt based on the style and other parameters
-        timestamps_instruction = (
-            "Include key timestamps for important points."
-            if include_timestamps
-            else "Do not include timestamps."
+        # Summarize long transcripts in parts so they fit the context window
+        transcript = await condense_transcript(transcript, model)
+        if not transcript:
+            return None
+
+        prompt = build_summary_prompt(
+            transcript,
+            style,
+            max_length,
+            include_timestamps,
+            video_title,
+            channel_name,
         )
 
-        # Add video title and channel name to the prompt if available
-        context = ""
-        if video_title and channel_name:
-            context = f"The video is titled '{video_title}' from the channel '{channel_name}'. "
+        # Call the OpenAI API
+        content, finish_reason = await create_completion(
+            model=model,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.5,
+            max_tokens=int(max_length) * SUMMARY_TOKENS_PER_WORD,
+        )
 
-        prompt = f"{context}Summarize the following YouTube video transcript in a {style} style with a maximum of {max_length} words. {timestamps_instruction}\n\nTRANSCRIPT:\n{transcript}"
+        if finish_reason == "length":
+            logger.warning("Summary was cut off at the token limit")
 
-        # Truncate the prompt if it's too long (OpenAI has token limits)
-        max_prompt_length = 16000  # A conservative limit
-        if len(prompt) > max_prompt_length:
-            logger.warning(
-                f"Transcript too long ({len(prompt)} chars), truncating to {max_prompt_length} chars"
-            )
-            prompt = (
-                prompt[:max_prompt_length] + "... [transcript truncated due to length]"
-            )
+        # Extract and return the summary
+        summary = content.strip()
+        return summary
+
+    except Exception as e:
+        logger.error(f"Error generating summary with OpenAI: {str(e)}")
+        return None
+
+
+async def generate_summary_and_tweet(
+    transcript,
+    video_id,
+    style="concise",
+    max_length=500,
+    include_timestamps=True,
+    video_title=None,
+    channel_name=None,
+    model=DEFAULT_MODEL,
+    tweet_max_length=280,
+):
+    """
+    Generate a video summary and a tweet about it in a single OpenAI request.
+
+    The model answers in JSON mode with "summary" and "tweet" fields, which
+    saves the second round-trip generate_tweet would make.
+
+    Args:
+        transcript (str): The video transcript text
+        video_id (str): The YouTube video ID
+        style (str): Summary style - "concise", "detailed", or "bullet_points"
+        max_length (int): Maximum length of the summary in words
+        include_timestamps (bool): Whether to include timestamps in the summary
+        video_title (str): The title of the video
+        channel_name (str): The name of the YouTube channel
+        model (str): The OpenAI model to use
+        tweet_max_length (int): Maximum length of the tweet
+
+    Returns:
+        tuple: (summary, tweet) where tweet may be None, or None if the
+            summary could not be generated
+    """
+    if not OPENAI_API_KEY:
+        logger.error("OpenAI API key not found in environment variables")
+        return None
+
+    if not transcript:
+        logger.error("No transcript provided for summarization")
+        return None
+
+    try:
+        # Summarize long transcripts in parts so they fit the context window
+        transcript = await condense_transcript(transcript, model)
+        if not transcript:
+            return None
+
+        video_url, attribution, available_length = get_tweet_layout(
+            video_id, channel_name, tweet_max_length
+        )
+
+        prompt = build_summary_prompt(
+            transcript,
+            style,
+            max_length,
+            include_timestamps,
+            video_title,
+            channel_name,
+        )
 
         # Call the OpenAI API
-        response = client.chat.completions.create(
+        content, finish_reason = await create_completion(
             model=model,
             messages=[
+                {"role": "system", "content": SUMMARY_AND_TWEET_SYSTEM_PROMPT},
                 {
-                    "role": "system",
-                    "content": "You are a helpful assistant that summarizes YouTube videos accurately and concisely.",
+                    "role": "user",
+                    "content": f"Tweet maximum length: {available_length} characters\n{prompt}",
                 },
-                {"role": "user", "content": prompt},
             ],
+            response_format={"type": "json_object"},
             temperature=0.5,
-            max_tokens=1000,
+            max_tokens=int(max_length) * SUMMARY_TOKENS_PER_WORD + TWEET_TOKEN_BUDGET,
         )
 
-        # Extract and return the summary
-        summary = response.choices[0].message.content.strip()
-        return summary
+        # Extract the summary and tweet
+        try:
+            if finish_reason == "length":
+                raise ValueError("response was cut off at the token limit")
+            result = json.loads(content)
+            summary = result["summary"].strip()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Fall back to separate requests rather than dropping the video
+            logger.warning(
+                f"Could not read combined summary and tweet, generating them separately: {str(e)}"
+            )
+            summary = await generate_summary(
+                transcript,
+                style=style,
+                max_length=max_length,
+                include_timestamps=include_timestamps,
+                video_title=video_title,
+                channel_name=channel_name,
+                model=model,
+            )
+            if not summary:
+                return None
+
+            tweet = await generate_tweet(
+                summary, video_title, video_id, channel_name, tweet_max_length
+            )
+            return summary, tweet
+
+        tweet = None
+        tweet_content = (result.get("tweet") or "").strip()
+        if available_length <= 50:
+            logger.warning("Not enough space for a meaningful tweet summary")
+        elif tweet_content:
+            tweet = format_tweet(
+                tweet_content, video_url, attribution, available_length
+            )
+
+        return summary, tweet
 
     except Exception as e:
-        logger.error(f"Error generating summary with OpenAI: {str(e)}")
+        logger.error(f"Error generating summary and tweet with OpenAI: {str(e)}")
         return None
 
 
-def generate_tweet(summary, video_title, video_id, channel_name, max_length=280):
+async def generate_tweet(summary, video_title, video_id, channel_name, max_length=280):
     """
     Generate a tweet-sized summary for posting to X (Twitter).
 
@@ -120,36 +536,26 @@ def generate_tweet(summary, video_title, video_id, channel_name, max_length=280)
         return None
 
     try:
-        # Calculate the length of the video URL and attribution
-        video_url = f"https://youtu.be/{video_id}"
-        attribution = f" - {channel_name}"
-
-        # Calculate the available length for the summary
-        # Account for spaces between components and a buffer
-        available_length = max_length - len(video_url) - len(attribution) - 3
+        video_url, attribution, available_length = get_tweet_layout(
+            video_id, channel_name, max_length
+        )
 
         if available_length <= 50:
             logger.warning("Not enough space for a meaningful tweet summary")
             return None
 
-        prompt = f"""
-        Create a concise and engaging tweet about this YouTube video that will make people want to watch it.
-        Video title: {video_title}
-        Channel: {channel_name}
-        Summary: {summary}
-        
-        The tweet must be no longer than {available_length} characters as I will add the video URL and attribution separately.
-        Do not include hashtags, the URL, or the channel name in your response.
-        """
+        prompt = f"""Tweet maximum length: {available_length} characters
+Title: {video_title}
+Channel: {channel_name}
+
+SUMMARY:
+{summary}"""
 
         # Call the OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        content, _ = await create_completion(
+            model=DEFAULT_MODEL,
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are a social media expert who creates engaging tweets.",
-                },
+                {"role": "system", "content": TWEET_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             temperature=0.7,
@@ -157,16 +563,9 @@ def generate_tweet(summary, video_title, video_id, channel_name, max_length=280)
         )
 
         # Extract the tweet content
-        tweet_content = response.choices[0].message.content.strip()
-
-        # Ensure the tweet is within the length limit
-        if len(tweet_content) > available_length:
-            tweet_content = tweet_content[: available_length - 3] + "..."
-
-        # Combine with the video URL and attribution
-        full_tweet = f"{tweet_content} {video_url}{attribution}"
+        tweet_content = content.strip()
 
-        return full_tweet
+        return format_tweet(tweet_content, video_url, attribution, available_length)
 
     except Exception as e:
         logger.error(f"Error generating tweet with OpenAI: {str(e)}")
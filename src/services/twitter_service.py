@@ -4,6 +4,7 @@ Twitter Service
 This module handles posting summaries to X (Twitter).
 """
 
+import asyncio
 import logging
 import os
 
@@ -23,9 +24,16 @@ TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET")
 TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 
+# Twitter API client, created once and reused across warm Lambda invocations
+_twitter_client = None
+
 
 def get_twitter_client():
-    """Create and return a Twitter API client."""
+    """Return the shared Twitter API client, creating it on first use."""
+    global _twitter_client
+    if _twitter_client is not None:
+        return _twitter_client
+
     if not all(
         [
             TWITTER_API_KEY,
@@ -39,19 +47,21 @@ def get_twitter_client():
 
     try:
         # Initialize the Twitter client
-        client = tweepy.Client(
+        _twitter_client = tweepy.Client(
             consumer_key=TWITTER_API_KEY,
             consumer_secret=TWITTER_API_SECRET,
             access_token=TWITTER_ACCESS_TOKEN,
             access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
         )
-        return client
+        return _twitter_client
     except Exception as e:
         logger.error(f"Error creating Twitter client: {str(e)}")
         return None
 
 
-def post_to_twitter(summary, video_id, video_title, channel_name):
+async def post_to_twitter(
+    summary, video_id, video_title, channel_name, tweet_content=None
+):
     """
     Post a summary of a YouTube video to X (Twitter).
 
@@ -60,6 +70,8 @@ def post_to_twitter(summary, video_id, video_title, channel_name):
         video_id (str): The YouTube video ID
         video_title (str): The title of the video
         channel_name (str): The name of the YouTube channel
+        tweet_content (str): Pre-generated tweet; generated from the summary
+            if not provided
 
     Returns:
         bool: True if successful, False otherwise
@@ -69,15 +81,18 @@ def post_to_twitter(summary, video_id, video_title, channel_name):
         return False
 
     try:
-        # Generate a tweet-sized summary
-        tweet_content = generate_tweet(summary, video_title, video_id, channel_name)
+        # Generate a tweet-sized summary if one wasn't provided
+        if not tweet_content:
+            tweet_content = await generate_tweet(
+                summary, video_title, video_id, channel_name
+            )
 
         if not tweet_content:
             logger.error("Failed to generate tweet content")
             return False
 
-        # Post the tweet
-        response = client.create_tweet(text=tweet_content)
+        # Post the tweet (tweepy is sync-only, so run it off the event loop)
+        response = await asyncio.to_thread(client.create_tweet, text=tweet_content)
 
         if response and hasattr(response, "data") and "id" in response.data:
             tweet_id = response.data["id"]
@@ -4,11 +4,18 @@ YouTube Service
 This module handles interactions with the YouTube API and transcript retrieval.
 """
 
+import asyncio
 import logging
 import os
+import threading
+from datetime import datetime
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from youtube_transcript_api import (
     YouTubeTranscriptApi,
     TranscriptsDisabled,
@@ -20,55 +27,214 @@ logger = logging.getLogger(__name__)
 # Get YouTube API key from environment variables
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# YouTube API client, built once and reused across warm Lambda invocations
+_youtube_client = None
+
+# httplib2 transports and transcript API clients are not thread-safe, so each
+# worker thread gets its own
+_thread_local = threading.local()
+
+# Uploads playlist ID of each channel, resolved once per container
+_uploads_playlists = {}
+
+# Maximum number of channel IDs per channels.list request
+CHANNELS_PER_REQUEST = 50
+
+# Transcript fragments that carry no spoken content
+NOISE_FRAGMENTS = {"[Music]", "[Applause]", "[Laughter]"}
+
+# Partial-response filters so the API only returns the fields we use
+CHANNEL_FIELDS = "items(id,contentDetails/relatedPlaylists/uploads)"
+PLAYLIST_ITEM_FIELDS = (
+    "items(snippet(title,channelTitle,publishedAt),"
+    "contentDetails(videoId,videoPublishedAt))"
+)
+VIDEO_DETAILS_FIELDS = (
+    "items(id,snippet(title,channelTitle,publishedAt),"
+    "contentDetails/duration,statistics/viewCount)"
+)
+
 
 def get_youtube_client():
-    """Create and return a YouTube API client."""
+    """Return the shared YouTube API client, creating it on first use."""
+    global _youtube_client
+    if _youtube_client is not None:
+        return _youtube_client
+
     if not YOUTUBE_API_KEY:
         logger.error("YouTube API key not found in environment variables")
         return None
 
     try:
-        youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
-        return youtube
+        # Load the discovery document bundled with the client library
+        # instead of fetching it over HTTP
+        _youtube_client = build(
+            "youtube",
+            "v3",
+            developerKey=YOUTUBE_API_KEY,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+        return _youtube_client
     except Exception as e:
         logger.error(f"Error creating YouTube client: {str(e)}")
         return None
 
 
+def _get_http():
+    """Return the HTTP transport for the current thread."""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = _thread_local.http = build_http()
+    return http
+
+
+def _get_transcript_api():
+    """
+    Return the transcript API client for the current thread.
+
+    The client keeps a pooled, keep-alive HTTP session with retries, so
+    transcript requests made by the same thread reuse TLS connections.
+    """
+    transcript_api = getattr(_thread_local, "transcript_api", None)
+    if transcript_api is None:
+        session = Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+        transcript_api = _thread_local.transcript_api = YouTubeTranscriptApi(
+            http_client=session
+        )
+    return transcript_api
+
+
+def _parse_timestamp(value):
+    """Parse an ISO 8601 timestamp such as 2023-01-01T00:00:00Z."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def get_uploads_playlist_ids(channel_ids):
+    """
+    Get the uploads playlist ID of each channel.
+
+    IDs are cached for the lifetime of the container, and channels that are
+    not cached yet are looked up in batches of up to 50 per request.
+
+    Args:
+        channel_ids (list): The YouTube channel IDs
+
+    Returns:
+        dict: Mapping of channel ID to uploads playlist ID for the channels
+            that could be resolved
+    """
+    missing = [
+        channel_id for channel_id in channel_ids if channel_id not in _uploads_playlists
+    ]
+
+    if missing:
+        youtube = get_youtube_client()
+        if not youtube:
+            return {}
+
+        try:
+            for start in range(0, len(missing), CHANNELS_PER_REQUEST):
+                batch = missing[start : start + CHANNELS_PER_REQUEST]
+                channels_response = (
+                    youtube.channels()
+                    .list(
+                        part="contentDetails",
+                        id=",".join(batch),
+                        maxResults=CHANNELS_PER_REQUEST,
+                        fields=CHANNEL_FIELDS,
+                    )
+                    .execute(http=_get_http())
+                )
+
+                for item in channels_response.get("items", []):
+                    _uploads_playlists[item["id"]] = item["contentDetails"][
+                        "relatedPlaylists"
+                    ]["uploads"]
+
+        except HttpError as e:
+            logger.error(f"YouTube API error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error fetching uploads playlists: {str(e)}")
+
+    return {
+        channel_id: _uploads_playlists[channel_id]
+        for channel_id in channel_ids
+        if channel_id in _uploads_playlists
+    }
+
+
 def get_channel_videos(channel_id, max_results=5, published_after=None):
     """
     Get recent videos from a YouTube channel.
 
+    Videos are read from the channel's uploads playlist, which costs 1 quota
+    unit per request instead of the 100 units of a search request.
+
     Args:
         channel_id (str): The YouTube channel ID
         max_results (int): Maximum number of videos to return
         published_after (str): ISO 8601 timestamp (e.g., 2023-01-01T00:00:00Z)
 
     Returns:
-        list: List of video items or None if an error occurs
+        list: List of video items or None if an error occurs. Items have the
+            same shape as search results ({"id": {"videoId": ...}, "snippet": ...})
     """
     youtube = get_youtube_client()
     if not youtube:
         return None
 
+    playlist_id = get_uploads_playlist_ids([channel_id]).get(channel_id)
+    if not playlist_id:
+        logger.error(f"Uploads playlist not found for channel {channel_id}")
+        return None
+
     try:
-        # Build the search request
-        search_params = {
-            "part": "snippet",
-            "channelId": channel_id,
-            "maxResults": max_results,
-            "order": "date",
-            "type": "video",
-        }
+        # Execute the playlist request, newest uploads first
+        playlist_response = (
+            youtube.playlistItems()
+            .list(
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
+                maxResults=max_results,
+                fields=PLAYLIST_ITEM_FIELDS,
+            )
+            .execute(http=_get_http())
+        )
+
+        # Only keep videos published after the given timestamp
+        cutoff = _parse_timestamp(published_after) if published_after else None
 
-        # Add publishedAfter parameter if provided
-        if published_after:
-            search_params["publishedAfter"] = published_after
+        videos = []
+        for item in playlist_response.get("items", []):
+            # Private and deleted videos have no publish date
+            published_at = item["contentDetails"].get("videoPublishedAt")
+            if not published_at:
+                continue
 
-        # Execute the search request
-        search_response = youtube.search().list(**search_params).execute()
+            if cutoff and _parse_timestamp(published_at) < cutoff:
+                continue
 
-        return search_response.get("items", [])
+            videos.append(
+                {
+                    "id": {"videoId": item["contentDetails"]["videoId"]},
+                    "snippet": item["snippet"],
+                }
+            )
+
+        return videos
 
     except HttpError as e:
         logger.error(f"YouTube API error: {str(e)}")
@@ -90,7 +256,7 @@ def get_video_transcript(video_id, language_code="en"):
         str: Concatenated transcript text or None if an error occurs
     """
     try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcript_list = _get_transcript_api().list(video_id)
 
         # Try to get the transcript in the specified language
         try:
@@ -109,8 +275,12 @@ def get_video_transcript(video_id, language_code="en"):
         # Get the transcript data
         transcript_data = transcript.fetch()
 
-        # Concatenate the transcript text
-        full_transcript = " ".join([entry["text"] for entry in transcript_data])
+        # Concatenate the transcript text, dropping empty and noise fragments
+        full_transcript = " ".join(
+            text
+            for text in (snippet.text.strip() for snippet in transcript_data)
+            if text and text not in NOISE_FRAGMENTS
+        )
 
         return full_transcript
 
@@ -125,12 +295,30 @@ def get_video_transcript(video_id, language_code="en"):
         return None
 
 
-def get_video_details(video_id):
+async def get_channel_videos_async(channel_id, max_results=5, published_after=None):
+    """Run get_channel_videos in a worker thread so callers can await it."""
+    return await asyncio.to_thread(
+        get_channel_videos,
+        channel_id,
+        max_results=max_results,
+        published_after=published_after,
+    )
+
+
+async def get_video_transcript_async(video_id, language_code="en"):
+    """Run get_video_transcript in a worker thread so callers can await it."""
+    return await asyncio.to_thread(
+        get_video_transcript, video_id, language_code=language_code
+    )
+
+
+def get_video_details(video_id, fields=VIDEO_DETAILS_FIELDS):
     """
     Get detailed information about a YouTube video.
 
     Args:
         video_id (str): The YouTube video ID
+        fields (str): Partial-response filter for the returned fields
 
     Returns:
         dict: Video details or None if an error occurs
@@ -142,8 +330,8 @@ def get_video_details(video_id):
     try:
         video_response = (
             youtube.videos()
-            .list(part="snippet,contentDetails,statistics", id=video_id)
-            .execute()
+            .list(part="snippet,contentDetails,statistics", id=video_id, fields=fields)
+            .execute(http=_get_http())
         )
 
         if not video_response.get("items"):
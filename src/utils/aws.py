@@ -0,0 +1,25 @@
+"""
+AWS Utility
+
+This module holds the botocore settings shared by all AWS clients.
+"""
+
+from functools import lru_cache
+
+# Keep connections alive, fail fast on unreachable endpoints, and retry
+# with client-side rate limiting
+BOTO_CONFIG = {
+    "max_pool_connections": 50,
+    "tcp_keepalive": True,
+    "retries": {"mode": "adaptive", "max_attempts": 10},
+    "connect_timeout": 3,
+    "read_timeout": 10,
+}
+
+
+@lru_cache(maxsize=1)
+def get_boto_config():
+    """Return the shared botocore Config, importing botocore on first use."""
+    from botocore.config import Config
+
+    return Config(**BOTO_CONFIG)
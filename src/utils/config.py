@@ -7,10 +7,21 @@ This module handles loading and validating configuration for the application.
 import json
 import logging
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
 
-import boto3
 from botocore.exceptions import ClientError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from src.utils.aws import get_boto_config
+
+# orjson is an optional faster JSON parser that reads UTF-8 bytes directly
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +33,108 @@ S3_CONFIG_BUCKET = os.getenv("S3_CONFIG_BUCKET")
 S3_CONFIG_KEY = os.getenv("S3_CONFIG_KEY", "channels.json")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 
+# Shared S3 client, built on first use
+_s3_client = None
+
+# ETag and parsed content of the last configuration downloaded from S3
+_s3_config_etag = None
+_s3_config = None
+
+# Read S3 objects in 1 MiB chunks rather than botocore's small default buffer
+S3_READ_CHUNK_SIZE = 1024 * 1024
+
+# Keys every configuration must define
+REQUIRED_CONFIG_KEYS = frozenset({"channels", "global_settings"})
+REQUIRED_GLOBAL_SETTINGS = frozenset(
+    {"default_summary_style", "default_summary_length", "default_include_timestamps"}
+)
+
+# Read-only configuration used when no valid configuration can be loaded
+DEFAULT_CONFIG = MappingProxyType(
+    {
+        "channels": (
+            MappingProxyType(
+                {
+                    "name": "Example Channel",
+                    "channel_id": "UC_x5XG1OV2P6uZZ5FSM9Ttw",  # Google Developers channel
+                    "summary_style": "concise",
+                    "summary_length": 500,
+                    "include_timestamps": True,
+                    "post_to_twitter": False,
+                    "post_to_blog": False,
+                }
+            ),
+        ),
+        "global_settings": MappingProxyType(
+            {
+                "default_summary_style": "concise",
+                "default_summary_length": 500,
+                "default_include_timestamps": True,
+                "max_videos_per_channel": 3,
+                "days_to_look_back": 1,
+                "openai_model": "gpt-4o-mini",
+            }
+        ),
+    }
+)
+
+
+@lru_cache(maxsize=4)
+def _parse_config_file(config_path, mtime):
+    """
+    Parse a JSON configuration file.
+
+    The modification time is part of the cache key, so an edited file is
+    parsed again on the next call.
+
+    Args:
+        config_path (str): Path to the configuration file
+        mtime (float): Modification time of the file
+
+    Returns:
+        dict: Configuration data
+    """
+    with open(config_path, "rb") as f:
+        return json_loads(f.read())
+
+
+def _read_config_file(config_path):
+    """
+    Read a JSON configuration file, raising if it cannot be loaded.
+
+    Args:
+        config_path (str): Path to the configuration file
+
+    Returns:
+        dict: Configuration data
+    """
+    mtime = os.stat(config_path).st_mtime
+    return _parse_config_file(config_path, mtime)
+
+
+def _log_config_file_error(config_path, error):
+    """
+    Log why a configuration file could not be loaded.
+
+    Args:
+        config_path (str): Path to the configuration file
+        error (Exception): The error raised while loading it
+    """
+    if isinstance(error, FileNotFoundError):
+        logger.error(f"Configuration file not found: {config_path}")
+    elif isinstance(error, json.JSONDecodeError):
+        logger.error(f"Error parsing configuration file: {str(error)}")
+    else:
+        logger.error(f"Error loading configuration from file: {str(error)}")
+
 
 def load_config_from_file(config_path=DEFAULT_CONFIG_PATH):
     """
     Load configuration from a local JSON file.
 
+    The parsed file is cached until it is modified, so callers share the
+    returned dict and must not mutate it.
+
     Args:
         config_path (str): Path to the configuration file
 
@@ -34,21 +142,9 @@ def load_config_from_file(config_path=DEFAULT_CONFIG_PATH):
         dict: Configuration data or None if an error occurs
     """
     try:
-        config_path = Path(config_path)
-        if not config_path.exists():
-            logger.error(f"Configuration file not found: {config_path}")
-            return None
-
-        with open(config_path, "r") as f:
-            config = json.load(f)
-
-        return config
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing configuration file: {str(e)}")
-        return None
+        return _read_config_file(config_path)
     except Exception as e:
-        logger.error(f"Error loading configuration from file: {str(e)}")
+        _log_config_file_error(config_path, e)
         return None
 
 
@@ -56,18 +152,39 @@ def load_config_from_s3():
     """
     Load configuration from an S3 bucket.
 
+    The object is only downloaded again when its ETag has changed since the
+    last load; otherwise the previously parsed configuration is returned.
+
     Returns:
         dict: Configuration data or None if an error occurs
     """
+    global _s3_client, _s3_config_etag, _s3_config
+
     if not S3_CONFIG_BUCKET or not S3_CONFIG_KEY:
         logger.warning("S3 configuration not set, skipping S3 config load")
         return None
 
     try:
-        s3_client = boto3.client("s3", region_name=AWS_REGION)
-        response = s3_client.get_object(Bucket=S3_CONFIG_BUCKET, Key=S3_CONFIG_KEY)
-        config_content = response["Body"].read().decode("utf-8")
-        config = json.loads(config_content)
+        if _s3_client is None:
+            # Imported on first use, as boto3 is slow to import
+            import boto3
+
+            _s3_client = boto3.client(
+                "s3", region_name=AWS_REGION, config=get_boto_config()
+            )
+
+        # Ask S3 to skip the body if the object has not changed
+        request = {"Bucket": S3_CONFIG_BUCKET, "Key": S3_CONFIG_KEY}
+        if _s3_config_etag:
+            request["IfNoneMatch"] = _s3_config_etag
+
+        response = _s3_client.get_object(**request)
+        content = bytearray()
+        for chunk in response["Body"].iter_chunks(chunk_size=S3_READ_CHUNK_SIZE):
+            content += chunk
+
+        config = json_loads(content)
+        _s3_config_etag, _s3_config = response["ETag"], config
 
         logger.info(
             f"Successfully loaded configuration from S3: {S3_CONFIG_BUCKET}/{S3_CONFIG_KEY}"
@@ -75,6 +192,9 @@ def load_config_from_s3():
         return config
 
     except ClientError as e:
+        if e.response["Error"]["Code"] in ("304", "NotModified"):
+            logger.info("Configuration in S3 has not changed, using cached copy")
+            return _s3_config
         if e.response["Error"]["Code"] == "NoSuchKey":
             logger.warning(
                 f"Configuration file not found in S3: {S3_CONFIG_BUCKET}/{S3_CONFIG_KEY}"
@@ -87,98 +207,170 @@ def load_config_from_s3():
         return None
 
 
-def validate_config(config):
+class ChannelConfig(BaseModel):
+    """A YouTube channel to summarize, with its overrides of the defaults."""
+
+    model_config = ConfigDict(extra="allow")
+
+    channel_id: str
+    name: str
+    summary_style: Optional[str] = None
+    summary_length: Optional[int] = None
+    include_timestamps: Optional[bool] = None
+    post_to_twitter: Optional[bool] = None
+    post_to_blog: Optional[bool] = None
+
+
+class GlobalSettings(BaseModel):
+    """Defaults applied to channels that do not override them."""
+
+    model_config = ConfigDict(extra="allow")
+
+    default_summary_style: str
+    default_summary_length: int
+    default_include_timestamps: bool
+    max_videos_per_channel: Optional[int] = None
+    days_to_look_back: Optional[int] = None
+    openai_model: Optional[str] = None
+
+
+class AppConfig(BaseModel):
+    """The application configuration."""
+
+    model_config = ConfigDict(extra="allow")
+
+    channels: list[ChannelConfig] = Field(min_length=1)
+    global_settings: GlobalSettings
+
+
+def parse_config(config):
     """
-    Validate the configuration data.
+    Validate the configuration data and convert its values to their types.
+
+    Settings that are not given stay absent, so callers can still fall back
+    to their defaults with dict.get.
 
     Args:
         config (dict): Configuration data to validate
 
     Returns:
-        bool: True if valid, False otherwise
+        dict: The converted configuration data or None if it is invalid
     """
     if not config:
         logger.error("Configuration is empty")
-        return False
-
-    # Check for required top-level keys
-    required_keys = ["channels", "global_settings"]
-    for key in required_keys:
-        if key not in config:
-            logger.error(f"Missing required configuration key: {key}")
-            return False
-
-    # Check if channels is a list and not empty
-    if not isinstance(config["channels"], list) or not config["channels"]:
-        logger.error("Channels configuration must be a non-empty list")
-        return False
-
-    # Check each channel for required fields
-    for i, channel in enumerate(config["channels"]):
-        if not isinstance(channel, dict):
-            logger.error(f"Channel at index {i} is not a dictionary")
-            return False
-
-        if "channel_id" not in channel or "name" not in channel:
-            logger.error(
-                f"Channel at index {i} is missing required fields (channel_id, name)"
-            )
-            return False
+        return None
 
-    # Check global settings for required fields
-    required_global_settings = [
-        "default_summary_style",
-        "default_summary_length",
-        "default_include_timestamps",
-    ]
+    if not isinstance(config, dict):
+        logger.error("Configuration must be a JSON object")
+        return None
 
-    for key in required_global_settings:
-        if key not in config["global_settings"]:
-            logger.error(f"Missing required global setting: {key}")
-            return False
+    # Report missing keys before running the full model validation
+    missing = REQUIRED_CONFIG_KEYS - config.keys()
+    if missing:
+        logger.error(f"Missing required configuration keys: {sorted(missing)}")
+        return None
 
-    return True
+    global_settings = config["global_settings"]
+    if isinstance(global_settings, dict):
+        missing = REQUIRED_GLOBAL_SETTINGS - global_settings.keys()
+        if missing:
+            logger.error(f"Missing required global settings: {sorted(missing)}")
+            return None
+
+    try:
+        return AppConfig.model_validate(config).model_dump(exclude_unset=True)
+
+    except ValidationError as e:
+        for error in e.errors():
+            location = ".".join(str(part) for part in error["loc"])
+            logger.error(f"Invalid configuration at {location}: {error['msg']}")
+        return None
 
 
+def validate_config(config):
+    """
+    Validate the configuration data.
+
+    Args:
+        config (dict): Configuration data to validate
+
+    Returns:
+        bool: True if valid, False otherwise
+    """
+    return parse_config(config) is not None
+
+
+@lru_cache(maxsize=1)
 def load_config():
     """
     Load configuration from S3 or local file, with validation.
 
+    Both sources are read concurrently and a valid S3 configuration takes
+    precedence over the local file. The result is cached, so warm Lambda
+    invocations reuse the configuration loaded by the first one; call
+    refresh_config() to pick up changes made in S3 since then.
+
     Returns:
-        dict: Validated configuration data
+        dict: Validated configuration data, or the read-only DEFAULT_CONFIG
     """
-    # Try to load from S3 first
-    config = load_config_from_s3()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        s3_future = executor.submit(load_config_from_s3)
 
-    # If S3 load failed, try local file
-    if not config:
+        # Read the local file speculatively; its errors only matter, and are
+        # only logged, when S3 does not provide the configuration
+        file_future = executor.submit(_read_config_file, DEFAULT_CONFIG_PATH)
+
+        # Prefer the S3 configuration
+        config = s3_future.result()
+        if config:
+            config = parse_config(config)
+            if config:
+                return config
+
+        # If S3 load failed, use the local file
         logger.info("Falling back to local configuration file")
-        config = load_config_from_file()
+        error = file_future.exception()
+        if error:
+            _log_config_file_error(DEFAULT_CONFIG_PATH, error)
+            config = None
+        else:
+            config = file_future.result()
 
     # Validate the configuration
-    if config and validate_config(config):
-        return config
+    if config:
+        config = parse_config(config)
+        if config:
+            return config
 
     # If all loading attempts failed or validation failed, use default configuration
     logger.warning("Using default configuration")
-    return {
-        "channels": [
-            {
-                "name": "Example Channel",
-                "channel_id": "UC_x5XG1OV2P6uZZ5FSM9Ttw",  # Google Developers channel
-                "summary_style": "concise",
-                "summary_length": 500,
-                "include_timestamps": True,
-                "post_to_twitter": False,
-                "post_to_blog": False,
-            }
-        ],
-        "global_settings": {
-            "default_summary_style": "concise",
-            "default_summary_length": 500,
-            "default_include_timestamps": True,
-            "max_videos_per_channel": 3,
-            "days_to_look_back": 1,
-            "openai_model": "gpt-4-turbo",
-        },
-    }
+    return DEFAULT_CONFIG
+
+
+def refresh_config():
+    """
+    Return the cached configuration, reloading it if it has changed in S3.
+
+    The S3 object is revalidated with its ETag, so an unchanged
+    configuration costs one request without a body.
+
+    Returns:
+        dict: Validated configuration data, or the read-only DEFAULT_CONFIG
+    """
+    config = load_config()
+    if not S3_CONFIG_BUCKET or not S3_CONFIG_KEY:
+        return config
+
+    etag = _s3_config_etag
+    s3_config = load_config_from_s3()
+    if s3_config is None or _s3_config_etag == etag:
+        return config
+
+    # Keep the current configuration if the new one is invalid
+    if not validate_config(s3_config):
+        logger.warning("Configuration in S3 is invalid, keeping current one")
+        return config
+
+    logger.info("Configuration in S3 has changed, reloading")
+    load_config.cache_clear()
+    return load_config()
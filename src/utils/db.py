@@ -4,30 +4,132 @@ Database Utility
 This module handles DynamoDB operations for tracking processed videos.
 """
 
+import asyncio
 import json
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
 from botocore.exceptions import ClientError
 
+from src.utils.aws import get_boto_config
+
 logger = logging.getLogger(__name__)
 
 # DynamoDB configuration
 DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE", "daily-youtube-digest-videos")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 
+# Explanations logged for well-known DynamoDB error codes
+CLIENT_ERROR_HINTS = {
+    "ResourceNotFoundException": "the table does not exist",
+    "ProvisionedThroughputExceededException": "throughput still exceeded after retries",
+    "ThrottlingException": "requests still throttled after retries",
+}
+
+
+# Shared DynamoDB resource, client and table, built on first use
+_dynamodb_resource = None
+_dynamodb_client = None
+_table = None
+_client_lock = threading.Lock()
+
+# Set once the table is known to exist, so later calls skip the check
+_table_verified = False
+
+# Processed videos expire from the table after 90 days
+PROCESSED_VIDEO_TTL = 90 * 24 * 60 * 60
+
+# Number of segments scanned in parallel when reading the whole table
+SCAN_SEGMENTS = 8
+
+# BatchGetItem accepts at most 100 keys and BatchWriteItem 25 items per call
+BATCH_GET_SIZE = 100
+BATCH_WRITE_SIZE = 25
+
+# Attempts at resubmitting keys or items DynamoDB left unprocessed
+BATCH_RETRIES = 5
+
+
+def _log_client_error(action, error):
+    """
+    Log a DynamoDB ClientError by its error code and message.
+
+    Args:
+        action (str): What was being done when the error occurred
+        error (ClientError): The error raised by boto3
+    """
+    code = error.response["Error"].get("Code")
+    hint = CLIENT_ERROR_HINTS.get(code)
+
+    if hint:
+        message = error.response["Error"].get("Message")
+        logger.error(f"DynamoDB error {action}: {code}, {hint} ({message})")
+    else:
+        logger.error(f"DynamoDB error {action}: {str(error)}")
+
+
+def _get_video_id(item):
+    """Extract the video ID from an item returned by the low-level client."""
+    return item["video_id"]["S"]
+
 
 def get_dynamodb_client():
-    """Create and return a DynamoDB client."""
-    try:
-        dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-        return dynamodb
-    except Exception as e:
-        logger.error(f"Error creating DynamoDB client: {str(e)}")
+    """Return the shared DynamoDB resource, creating it on first use."""
+    global _dynamodb_resource, _dynamodb_client, _table
+
+    if _dynamodb_resource is None:
+        with _client_lock:
+            if _dynamodb_resource is None:
+                # Imported on first use, as boto3 is slow to import
+                import boto3
+
+                try:
+                    dynamodb = boto3.resource(
+                        "dynamodb",
+                        region_name=AWS_REGION,
+                        config=get_boto_config(),
+                    )
+                except Exception as e:
+                    logger.error(f"Error creating DynamoDB client: {str(e)}")
+                    return None
+
+                # The low-level client shares the resource's connection pool
+                _dynamodb_client = dynamodb.meta.client
+                _table = dynamodb.Table(DYNAMODB_TABLE)
+                _dynamodb_resource = dynamodb
+
+    return _dynamodb_resource
+
+
+def get_dynamodb_table():
+    """Return the shared handle to the processed videos table."""
+    if not get_dynamodb_client():
         return None
 
+    return _table
+
+
+def _ensure_ttl_enabled():
+    """Let DynamoDB delete expired items, enabling TTL if it is off."""
+    try:
+        response = _dynamodb_client.describe_time_to_live(TableName=DYNAMODB_TABLE)
+        status = response["TimeToLiveDescription"]["TimeToLiveStatus"]
+        if status != "DISABLED":
+            return
+
+        _dynamodb_client.update_time_to_live(
+            TableName=DYNAMODB_TABLE,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "ttl"},
+        )
+        logger.info(f"Enabled TTL on DynamoDB table: {DYNAMODB_TABLE}")
+
+    except ClientError as e:
+        # Items are still written with a ttl, so the table keeps working
+        _log_client_error("enabling TTL", e)
+
 
 def ensure_table_exists():
     """
@@ -36,16 +138,25 @@ def ensure_table_exists():
     Returns:
         bool: True if the table exists or was created, False otherwise
     """
+    global _table_verified
+
+    if _table_verified:
+        return True
+
     dynamodb = get_dynamodb_client()
     if not dynamodb:
         return False
 
     try:
         # Check if table exists
-        dynamodb_client = boto3.client("dynamodb", region_name=AWS_REGION)
-        existing_tables = dynamodb_client.list_tables()["TableNames"]
-
-        if DYNAMODB_TABLE in existing_tables:
+        try:
+            _dynamodb_client.describe_table(TableName=DYNAMODB_TABLE)
+        except _dynamodb_client.exceptions.ResourceNotFoundException:
+            pass
+        else:
+            # Tables created before items had a ttl may not have TTL enabled
+            _ensure_ttl_enabled()
+            _table_verified = True
             return True
 
         # Create the table if it doesn't exist
@@ -62,16 +173,50 @@ def ensure_table_exists():
         table.meta.client.get_waiter("table_exists").wait(TableName=DYNAMODB_TABLE)
         logger.info(f"Created DynamoDB table: {DYNAMODB_TABLE}")
 
+        _ensure_ttl_enabled()
+
+        _table_verified = True
         return True
 
     except ClientError as e:
-        logger.error(f"Error ensuring DynamoDB table exists: {str(e)}")
+        _log_client_error("ensuring the table exists", e)
         return False
     except Exception as e:
         logger.error(f"Unexpected error ensuring DynamoDB table exists: {str(e)}")
         return False
 
 
+def _scan_segment(segment):
+    """
+    Scan one segment of the table for processed video IDs.
+
+    Uses the low-level client, which unlike the table resource is safe to
+    share between threads.
+
+    Args:
+        segment (int): The 0-based segment number
+
+    Returns:
+        set: Video IDs in the segment
+    """
+    request = {
+        "TableName": DYNAMODB_TABLE,
+        "ProjectionExpression": "video_id",
+        "Segment": segment,
+        "TotalSegments": SCAN_SEGMENTS,
+    }
+    video_ids = set()
+
+    while True:
+        response = _dynamodb_client.scan(**request)
+        video_ids.update(map(_get_video_id, response.get("Items", ())))
+
+        # Handle pagination if there are more items
+        if "LastEvaluatedKey" not in response:
+            return video_ids
+        request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
 def get_processed_videos():
     """
     Get a list of already processed video IDs from DynamoDB.
@@ -84,74 +229,145 @@ def get_processed_videos():
         return set()
 
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(DYNAMODB_TABLE)
-
-        # Scan the table to get all processed videos
-        response = table.scan(ProjectionExpression="video_id")
-
-        # Extract video IDs from the response
-        video_ids = {item["video_id"] for item in response.get("Items", [])}
-
-        # Handle pagination if there are more items
-        while "LastEvaluatedKey" in response:
-            response = table.scan(
-                ProjectionExpression="video_id",
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-            )
-            video_ids.update({item["video_id"] for item in response.get("Items", [])})
+        # Scan the table segments in parallel to get all processed videos
+        with ThreadPoolExecutor(max_workers=SCAN_SEGMENTS) as executor:
+            segments = executor.map(_scan_segment, range(SCAN_SEGMENTS))
+            video_ids = set().union(*segments)
 
         logger.info(f"Retrieved {len(video_ids)} processed videos from DynamoDB")
         return video_ids
 
     except ClientError as e:
-        logger.error(f"DynamoDB error getting processed videos: {str(e)}")
+        _log_client_error("getting processed videos", e)
         return set()
     except Exception as e:
         logger.error(f"Error getting processed videos: {str(e)}")
         return set()
 
 
-def mark_video_as_processed(video_id, channel_name, summary):
+def filter_unprocessed(video_ids):
     """
-    Mark a video as processed in DynamoDB.
+    Get the video IDs that have not been processed yet.
+
+    Only the given IDs are looked up, using batched key reads instead of a
+    scan of the whole table.
 
     Args:
-        video_id (str): The YouTube video ID
-        channel_name (str): The name of the YouTube channel
-        summary (str): The generated summary
+        video_ids (list): Candidate YouTube video IDs
+
+    Returns:
+        set: The video IDs not found in DynamoDB
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+
+    if not ensure_table_exists():
+        logger.warning("DynamoDB table does not exist, treating all as unprocessed")
+        return set(video_ids)
+
+    try:
+        processed = set()
+
+        for start in range(0, len(video_ids), BATCH_GET_SIZE):
+            request_items = {
+                DYNAMODB_TABLE: {
+                    "Keys": [
+                        {"video_id": {"S": video_id}}
+                        for video_id in video_ids[start : start + BATCH_GET_SIZE]
+                    ],
+                    "ProjectionExpression": "video_id",
+                }
+            }
+
+            # Resubmit any keys DynamoDB could not process, with backoff
+            for attempt in range(BATCH_RETRIES):
+                response = _dynamodb_client.batch_get_item(RequestItems=request_items)
+                processed.update(
+                    map(_get_video_id, response["Responses"].get(DYNAMODB_TABLE, ()))
+                )
+                request_items = response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+                time.sleep(0.1 * 2**attempt)
+            else:
+                logger.error("DynamoDB left keys unprocessed after retries")
+                return set(video_ids) - processed
+
+        logger.info(f"{len(processed)} of {len(video_ids)} videos already processed")
+        return set(video_ids) - processed
+
+    except ClientError as e:
+        _log_client_error("checking processed videos", e)
+        return set(video_ids)
+    except Exception as e:
+        logger.error(f"Error checking processed videos: {str(e)}")
+        return set(video_ids)
+
+
+def _serialize_video(video, timestamp):
+    """
+    Build the DynamoDB item for a processed video in the low-level format.
+
+    Args:
+        video (dict): Dict with video_id, channel_name and summary keys
+        timestamp (int): Processing time in seconds since the epoch
+
+    Returns:
+        dict: The item with typed attribute values
+    """
+    item = {key: {"S": value} for key, value in video.items()}
+    item["processed_at"] = {"N": str(timestamp)}
+    item["ttl"] = {"N": str(timestamp + PROCESSED_VIDEO_TTL)}
+    return item
+
+
+def mark_videos_as_processed(videos):
+    """
+    Mark several videos as processed in DynamoDB using batched writes.
+
+    Items are serialized once and sent through the low-level client. A later
+    record of a video overwrites an earlier one, both within a call and in
+    the table.
+
+    Args:
+        videos (list): Dicts with video_id, channel_name and summary keys
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if all videos were written, False otherwise
     """
     if not ensure_table_exists():
         logger.error("Failed to ensure DynamoDB table exists")
         return False
 
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(DYNAMODB_TABLE)
-
-        # Create the item to store
-        timestamp = datetime.utcnow().isoformat()
-        item = {
-            "video_id": video_id,
-            "channel_name": channel_name,
-            "summary": summary,
-            "processed_at": timestamp,
+        # BatchWriteItem rejects duplicate keys, so keep the last record
+        timestamp = int(time.time())
+        items = {
+            video["video_id"]: _serialize_video(video, timestamp) for video in videos
         }
-
-        # Put the item in the table
-        table.put_item(Item=item)
-
-        logger.info(f"Marked video {video_id} as processed in DynamoDB")
+        requests = [{"PutRequest": {"Item": item}} for item in items.values()]
+
+        for start in range(0, len(requests), BATCH_WRITE_SIZE):
+            request_items = {DYNAMODB_TABLE: requests[start : start + BATCH_WRITE_SIZE]}
+
+            # Resubmit any items DynamoDB could not process, with backoff
+            for attempt in range(BATCH_RETRIES):
+                response = _dynamodb_client.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems")
+                if not request_items:
+                    break
+                time.sleep(0.1 * 2**attempt)
+            else:
+                logger.error("DynamoDB left items unprocessed after retries")
+                return False
+
+        logger.info(f"Marked {len(items)} videos as processed in DynamoDB")
         return True
 
     except ClientError as e:
-        logger.error(f"DynamoDB error marking video as processed: {str(e)}")
+        _log_client_error("marking videos as processed", e)
         return False
     except Exception as e:
-        logger.error(f"Error marking video as processed: {str(e)}")
+        logger.error(f"Error marking videos as processed: {str(e)}")
         return False
 
 
@@ -170,8 +386,7 @@ def get_video_summary(video_id):
         return None
 
     try:
-        dynamodb = get_dynamodb_client()
-        table = dynamodb.Table(DYNAMODB_TABLE)
+        table = get_dynamodb_table()
 
         # Get the item from the table
         response = table.get_item(Key={"video_id": video_id})
@@ -184,8 +399,18 @@ def get_video_summary(video_id):
         return response["Item"]
 
     except ClientError as e:
-        logger.error(f"DynamoDB error getting video summary: {str(e)}")
+        _log_client_error("getting video summary", e)
         return None
     except Exception as e:
         logger.error(f"Error getting video summary: {str(e)}")
         return None
+
+
+async def filter_unprocessed_async(video_ids):
+    """Run filter_unprocessed in a worker thread so callers can await it."""
+    return await asyncio.to_thread(filter_unprocessed, video_ids)
+
+
+async def mark_videos_as_processed_async(videos):
+    """Run mark_videos_as_processed in a worker thread so callers can await it."""
+    return await asyncio.to_thread(mark_videos_as_processed, videos)
@@ -0,0 +1,227 @@
+"""
+Tests for the configuration utility module.
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+# Add the src directory to the Python path
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import config as config_module
+from src.utils.config import (
+    AppConfig,
+    DEFAULT_CONFIG,
+    load_config,
+    load_config_from_s3,
+    parse_config,
+    refresh_config,
+    validate_config,
+)
+
+
+def make_config(**global_settings):
+    """Build a valid configuration, overriding the given global settings."""
+    return {
+        "channels": [{"channel_id": "UC123", "name": "Test Channel"}],
+        "global_settings": {
+            "default_summary_style": "concise",
+            "default_summary_length": 500,
+            "default_include_timestamps": True,
+            **global_settings,
+        },
+    }
+
+
+def make_s3_response(config, etag='"etag1"'):
+    """Build a mocked S3 get_object response holding the configuration."""
+    body = MagicMock()
+    body.iter_chunks.return_value = [json.dumps(config).encode()]
+    return {"Body": body, "ETag": etag}
+
+
+class TestValidateConfig(unittest.TestCase):
+    """Test cases for validate_config and parse_config."""
+
+    def test_valid_config(self):
+        """Test that a complete configuration is accepted."""
+        self.assertTrue(validate_config(make_config()))
+
+    def test_empty_config(self):
+        """Test that an empty configuration is rejected."""
+        with self.assertLogs(config_module.logger, level="ERROR") as logs:
+            self.assertFalse(validate_config({}))
+
+        self.assertIn("Configuration is empty", logs.output[0])
+
+    def test_non_dict_config(self):
+        """Test that a configuration that is not a JSON object is rejected."""
+        with self.assertLogs(config_module.logger, level="ERROR") as logs:
+            self.assertFalse(validate_config(["channels", "global_settings"]))
+
+        self.assertIn("must be a JSON object", logs.output[0])
+
+    def test_missing_config_keys(self):
+        """Test that missing top-level keys are reported before model validation."""
+        config = make_config()
+        del config["global_settings"]
+
+        with patch.object(AppConfig, "model_validate") as mock_validate:
+            with self.assertLogs(config_module.logger, level="ERROR") as logs:
+                self.assertFalse(validate_config(config))
+
+        mock_validate.assert_not_called()
+        self.assertIn("['global_settings']", logs.output[0])
+
+    def test_missing_global_settings(self):
+        """Test that missing global settings are reported before model validation."""
+        config = make_config()
+        del config["global_settings"]["default_summary_style"]
+
+        with patch.object(AppConfig, "model_validate") as mock_validate:
+            with self.assertLogs(config_module.logger, level="ERROR") as logs:
+                self.assertFalse(validate_config(config))
+
+        mock_validate.assert_not_called()
+        self.assertIn("['default_summary_style']", logs.output[0])
+
+    def test_invalid_setting_type(self):
+        """Test that pydantic errors are logged with their location."""
+        config = make_config(default_summary_length="long")
+
+        with self.assertLogs(config_module.logger, level="ERROR") as logs:
+            self.assertFalse(validate_config(config))
+
+        self.assertIn("global_settings.default_summary_length", logs.output[0])
+
+    def test_invalid_channel_override(self):
+        """Test that per-channel overrides are validated."""
+        config = make_config()
+        config["channels"][0]["summary_length"] = "lots"
+
+        with self.assertLogs(config_module.logger, level="ERROR") as logs:
+            self.assertFalse(validate_config(config))
+
+        self.assertIn("channels.0.summary_length", logs.output[0])
+
+    def test_no_channels(self):
+        """Test that a configuration without channels is rejected."""
+        config = make_config()
+        config["channels"] = []
+
+        with self.assertLogs(config_module.logger, level="ERROR") as logs:
+            self.assertFalse(validate_config(config))
+
+        self.assertIn("Invalid configuration at channels", logs.output[0])
+
+    def test_parse_config_converts_values(self):
+        """Test that numeric strings are converted to integers."""
+        config = make_config(default_summary_length="500", days_to_look_back="2")
+        config["channels"][0]["summary_length"] = "300"
+
+        result = parse_config(config)
+
+        self.assertEqual(result["global_settings"]["default_summary_length"], 500)
+        self.assertEqual(result["global_settings"]["days_to_look_back"], 2)
+        self.assertEqual(result["channels"][0]["summary_length"], 300)
+
+    def test_parse_config_keeps_unset_settings_absent(self):
+        """Test that settings missing from the input are not filled with None."""
+        config = make_config(custom_setting="kept")
+
+        result = parse_config(config)
+
+        self.assertEqual(result, config)
+        self.assertNotIn("summary_style", result["channels"][0])
+
+
+class TestLoadConfig(unittest.TestCase):
+    """Test cases for loading the configuration from S3."""
+
+    def setUp(self):
+        """Reset the cached configuration and mock the S3 client."""
+        load_config.cache_clear()
+        self.addCleanup(load_config.cache_clear)
+
+        for name, value in [
+            ("S3_CONFIG_BUCKET", "test-bucket"),
+            ("_s3_client", MagicMock()),
+            ("_s3_config_etag", None),
+            ("_s3_config", None),
+        ]:
+            patcher = patch.object(config_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.mock_s3 = config_module._s3_client
+
+    def test_load_config_from_s3(self):
+        """Test that the S3 configuration is preferred and its ETag is stored."""
+        config = make_config()
+        self.mock_s3.get_object.return_value = make_s3_response(config)
+
+        self.assertEqual(load_config(), config)
+        self.assertEqual(config_module._s3_config_etag, '"etag1"')
+        self.mock_s3.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key=config_module.S3_CONFIG_KEY
+        )
+
+    def test_load_config_from_s3_not_modified(self):
+        """Test that an unchanged S3 object returns the cached configuration."""
+        config = make_config()
+        self.mock_s3.get_object.side_effect = [
+            make_s3_response(config),
+            ClientError({"Error": {"Code": "304"}}, "GetObject"),
+        ]
+
+        first = load_config_from_s3()
+        second = load_config_from_s3()
+
+        self.assertIs(second, first)
+        self.assertEqual(
+            self.mock_s3.get_object.call_args.kwargs["IfNoneMatch"], '"etag1"'
+        )
+
+    def test_load_config_falls_back_to_default(self):
+        """Test that the default configuration is used when no source is valid."""
+        self.mock_s3.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey"}}, "GetObject"
+        )
+
+        with patch.object(config_module, "DEFAULT_CONFIG_PATH", "missing.json"):
+            self.assertIs(load_config(), DEFAULT_CONFIG)
+
+    def test_refresh_config_reloads_changed_config(self):
+        """Test that a changed S3 configuration replaces the cached one."""
+        old_config = make_config()
+        new_config = make_config(default_summary_length=200)
+        self.mock_s3.get_object.side_effect = [
+            make_s3_response(old_config),
+            make_s3_response(new_config, etag='"etag2"'),
+            ClientError({"Error": {"Code": "304"}}, "GetObject"),
+        ]
+
+        self.assertEqual(load_config(), old_config)
+        self.assertEqual(refresh_config(), new_config)
+        self.assertEqual(load_config(), new_config)
+
+    def test_refresh_config_keeps_unchanged_config(self):
+        """Test that an unchanged S3 configuration keeps the cached one."""
+        self.mock_s3.get_object.side_effect = [
+            make_s3_response(make_config()),
+            ClientError({"Error": {"Code": "304"}}, "GetObject"),
+        ]
+
+        config = load_config()
+
+        self.assertIs(refresh_config(), config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+"""
+Tests for the DynamoDB utility module.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+# Add the src directory to the Python path
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import db
+from src.utils.db import (
+    DYNAMODB_TABLE,
+    ensure_table_exists,
+    filter_unprocessed,
+    mark_videos_as_processed,
+)
+
+
+class TestFilterUnprocessed(unittest.TestCase):
+    """Test cases for filter_unprocessed."""
+
+    def setUp(self):
+        """Mock the DynamoDB client and skip the table check and backoff."""
+        self.mock_client = MagicMock()
+
+        for patcher in [
+            patch.object(db, "_dynamodb_client", self.mock_client),
+            patch.object(db, "ensure_table_exists", return_value=True),
+            patch.object(db.time, "sleep"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_filter_unprocessed_deduplicates_keys(self):
+        """Test that duplicate video IDs are requested once."""
+        self.mock_client.batch_get_item.return_value = {
+            "Responses": {DYNAMODB_TABLE: [{"video_id": {"S": "a"}}]}
+        }
+
+        result = filter_unprocessed(["a", "b", "a"])
+
+        self.assertEqual(result, {"b"})
+        request_items = self.mock_client.batch_get_item.call_args.kwargs["RequestItems"]
+        self.assertEqual(
+            request_items[DYNAMODB_TABLE]["Keys"],
+            [{"video_id": {"S": "a"}}, {"video_id": {"S": "b"}}],
+        )
+
+    def test_filter_unprocessed_retries_unprocessed_keys(self):
+        """Test that keys DynamoDB did not process are requested again."""
+        unprocessed_keys = {DYNAMODB_TABLE: {"Keys": [{"video_id": {"S": "b"}}]}}
+        self.mock_client.batch_get_item.side_effect = [
+            {
+                "Responses": {DYNAMODB_TABLE: [{"video_id": {"S": "a"}}]},
+                "UnprocessedKeys": unprocessed_keys,
+            },
+            {"Responses": {DYNAMODB_TABLE: [{"video_id": {"S": "b"}}]}},
+        ]
+
+        result = filter_unprocessed(["a", "b", "c"])
+
+        self.assertEqual(result, {"c"})
+        self.assertEqual(self.mock_client.batch_get_item.call_count, 2)
+        self.mock_client.batch_get_item.assert_called_with(
+            RequestItems=unprocessed_keys
+        )
+        db.time.sleep.assert_called_once()
+
+    def test_filter_unprocessed_gives_up_after_retries(self):
+        """Test that keys left unprocessed after all retries count as new."""
+        self.mock_client.batch_get_item.return_value = {
+            "Responses": {DYNAMODB_TABLE: []},
+            "UnprocessedKeys": {DYNAMODB_TABLE: {"Keys": [{"video_id": {"S": "a"}}]}},
+        }
+
+        result = filter_unprocessed(["a"])
+
+        self.assertEqual(result, {"a"})
+        self.assertEqual(self.mock_client.batch_get_item.call_count, db.BATCH_RETRIES)
+
+    def test_filter_unprocessed_client_error(self):
+        """Test that all videos count as new when DynamoDB fails."""
+        self.mock_client.batch_get_item.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerError"}}, "BatchGetItem"
+        )
+
+        result = filter_unprocessed(["a", "b"])
+
+        self.assertEqual(result, {"a", "b"})
+
+
+class TestMarkVideosAsProcessed(unittest.TestCase):
+    """Test cases for mark_videos_as_processed."""
+
+    def setUp(self):
+        """Mock the DynamoDB client and skip the table check and backoff."""
+        self.mock_client = MagicMock()
+        self.mock_client.batch_write_item.return_value = {}
+
+        for patcher in [
+            patch.object(db, "_dynamodb_client", self.mock_client),
+            patch.object(db, "ensure_table_exists", return_value=True),
+            patch.object(db.time, "sleep"),
+            patch.object(db.time, "time", return_value=1000),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_writes_serialized_items(self):
+        """Test that videos are written as typed items with a TTL."""
+        videos = [{"video_id": "a", "channel_name": "Channel", "summary": "S"}]
+
+        self.assertTrue(mark_videos_as_processed(videos))
+
+        self.mock_client.batch_write_item.assert_called_once_with(
+            RequestItems={
+                DYNAMODB_TABLE: [
+                    {
+                        "PutRequest": {
+                            "Item": {
+                                "video_id": {"S": "a"},
+                                "channel_name": {"S": "Channel"},
+                                "summary": {"S": "S"},
+                                "processed_at": {"N": "1000"},
+                                "ttl": {"N": str(1000 + db.PROCESSED_VIDEO_TTL)},
+                            }
+                        }
+                    }
+                ]
+            }
+        )
+
+    def test_splits_batches_and_keeps_last_duplicate(self):
+        """Test that writes are split into batches of 25 without duplicate keys."""
+        videos = [
+            {"video_id": str(i % 30), "channel_name": "Channel", "summary": str(i)}
+            for i in range(31)
+        ]
+
+        self.assertTrue(mark_videos_as_processed(videos))
+
+        batches = [
+            call.kwargs["RequestItems"][DYNAMODB_TABLE]
+            for call in self.mock_client.batch_write_item.call_args_list
+        ]
+        self.assertEqual([len(batch) for batch in batches], [25, 5])
+        self.assertEqual(batches[0][0]["PutRequest"]["Item"]["summary"], {"S": "30"})
+
+    def test_retries_unprocessed_items(self):
+        """Test that items DynamoDB did not process are written again."""
+        unprocessed_items = {DYNAMODB_TABLE: [{"PutRequest": {"Item": {}}}]}
+        self.mock_client.batch_write_item.side_effect = [
+            {"UnprocessedItems": unprocessed_items},
+            {"UnprocessedItems": {}},
+        ]
+        videos = [{"video_id": "a", "channel_name": "Channel", "summary": "S"}]
+
+        self.assertTrue(mark_videos_as_processed(videos))
+
+        self.mock_client.batch_write_item.assert_called_with(
+            RequestItems=unprocessed_items
+        )
+
+    def test_gives_up_after_retries(self):
+        """Test that items left unprocessed after all retries fail the write."""
+        self.mock_client.batch_write_item.return_value = {
+            "UnprocessedItems": {DYNAMODB_TABLE: [{"PutRequest": {"Item": {}}}]}
+        }
+        videos = [{"video_id": "a", "channel_name": "Channel", "summary": "S"}]
+
+        with self.assertLogs(db.logger, level="ERROR"):
+            self.assertFalse(mark_videos_as_processed(videos))
+
+        self.assertEqual(self.mock_client.batch_write_item.call_count, db.BATCH_RETRIES)
+
+
+class TestEnsureTableExists(unittest.TestCase):
+    """Test cases for ensure_table_exists."""
+
+    def setUp(self):
+        """Reset the verified flag and mock the DynamoDB clients."""
+        self.mock_client = MagicMock()
+        self.mock_client.exceptions.ResourceNotFoundException = type(
+            "ResourceNotFoundException", (Exception,), {}
+        )
+
+        for patcher in [
+            patch.object(db, "_table_verified", False),
+            patch.object(db, "_dynamodb_client", self.mock_client),
+            patch.object(db, "get_dynamodb_client", return_value=MagicMock()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_existing_table_enables_ttl(self):
+        """Test that TTL is enabled on an existing table where it is off."""
+        self.mock_client.describe_time_to_live.return_value = {
+            "TimeToLiveDescription": {"TimeToLiveStatus": "DISABLED"}
+        }
+
+        self.assertTrue(ensure_table_exists())
+
+        self.mock_client.update_time_to_live.assert_called_once_with(
+            TableName=DYNAMODB_TABLE,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "ttl"},
+        )
+
+    def test_existing_table_with_ttl(self):
+        """Test that TTL is left alone when it is already enabled."""
+        self.mock_client.describe_time_to_live.return_value = {
+            "TimeToLiveDescription": {"TimeToLiveStatus": "ENABLED"}
+        }
+
+        self.assertTrue(ensure_table_exists())
+        self.assertTrue(ensure_table_exists())
+
+        self.mock_client.describe_table.assert_called_once()
+        self.mock_client.update_time_to_live.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
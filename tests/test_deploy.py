@@ -0,0 +1,367 @@
+"""
+Tests for the deployment script.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import MagicMock, patch
+
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import WaiterError
+
+# Add the src directory to the Python path
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import deploy
+
+
+class TestBuildWheelhouse(unittest.TestCase):
+    """Test cases for build_wheelhouse."""
+
+    def setUp(self):
+        """Use a temporary wheelhouse and mock pip."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.requirements_file = self.temp_dir / "requirements.txt"
+        self.requirements_file.write_text("requests==2.31.0\n")
+
+        for patcher in [
+            patch.object(deploy, "WHEELHOUSE_DIR", self.temp_dir / "wheelhouse"),
+            patch.object(deploy.subprocess, "check_call"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        deploy.WHEELHOUSE_DIR.mkdir()
+
+    def test_reuses_wheelhouse(self):
+        """Test that unchanged requirements reuse the built wheels."""
+        deploy.build_wheelhouse(self.requirements_file)
+        deploy.build_wheelhouse(self.requirements_file)
+
+        deploy.subprocess.check_call.assert_called_once()
+
+    def test_rebuilds_for_other_platform(self):
+        """Test that wheels are built again for another Python or platform."""
+        deploy.build_wheelhouse(self.requirements_file)
+        with patch.object(deploy.sysconfig, "get_platform", return_value="other"):
+            deploy.build_wheelhouse(self.requirements_file)
+
+        self.assertEqual(deploy.subprocess.check_call.call_count, 2)
+
+
+class TestSourceHash(unittest.TestCase):
+    """Test cases for compute_source_hash and package reuse."""
+
+    def setUp(self):
+        """Create a source tree in a temporary working directory."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+
+        self.src_dir = self.temp_dir / "src"
+        (self.src_dir / "__pycache__").mkdir(parents=True)
+        (self.src_dir / "main.py").write_text("print('hello')\n")
+        self.requirements_file = self.temp_dir / "requirements.txt"
+        self.requirements_file.write_text("requests==2.31.0\n")
+
+    def source_hash(self):
+        """Return the hash of the temporary source tree."""
+        return deploy.compute_source_hash(self.src_dir, self.requirements_file)
+
+    def test_hash_follows_sources_and_requirements(self):
+        """Test that editing a source file or the requirements changes the hash."""
+        original = self.source_hash()
+
+        (self.src_dir / "main.py").write_text("print('changed')\n")
+        edited_source = self.source_hash()
+        self.requirements_file.write_text("requests==2.32.0\n")
+        edited_requirements = self.source_hash()
+
+        self.assertEqual(len({original, edited_source, edited_requirements}), 3)
+
+    def test_hash_ignores_build_artifacts(self):
+        """Test that bytecode and ignored directories do not change the hash."""
+        original = self.source_hash()
+
+        (self.src_dir / "__pycache__" / "main.cpython-39.pyc").write_bytes(b"pyc")
+        (self.src_dir / "stale.pyc").write_bytes(b"pyc")
+
+        self.assertEqual(self.source_hash(), original)
+
+    def test_unchanged_sources_reuse_package(self):
+        """Test that a package built from the same sources is reused."""
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        deploy.PACKAGE_PATH.write_bytes(b"zip")
+        deploy.PACKAGE_HASH_PATH.write_text(self.source_hash())
+
+        with patch.object(deploy, "build_wheelhouse") as mock_build_wheelhouse:
+            package = deploy.create_deployment_package()
+
+        self.assertEqual(package, str(deploy.PACKAGE_PATH))
+        mock_build_wheelhouse.assert_not_called()
+
+    def test_package_without_tokenizer_is_rebuilt(self):
+        """Test that a package built without tokenizer files is not reused."""
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        deploy.PACKAGE_PATH.write_bytes(b"zip")
+        deploy.PACKAGE_HASH_PATH.write_text(self.source_hash() + "-without-tokenizer")
+
+        with patch.object(
+            deploy, "build_wheelhouse"
+        ) as mock_build_wheelhouse, patch.object(
+            deploy.subprocess, "check_call"
+        ), patch.object(
+            deploy, "bundle_tiktoken_cache", return_value=True
+        ):
+            deploy.create_deployment_package()
+
+        mock_build_wheelhouse.assert_called_once()
+        self.assertEqual(deploy.PACKAGE_HASH_PATH.read_text(), self.source_hash())
+
+
+class TestWriteZip(unittest.TestCase):
+    """Test cases for write_zip."""
+
+    def setUp(self):
+        """Create a temporary directory for the files to package."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+
+    def test_compression_per_file(self):
+        """Test that native extensions are deflated and wheels stored."""
+        entries = []
+        for name in ("module.py", "native.so", "bundled.whl"):
+            path = self.temp_dir / name
+            path.write_bytes(b"\0" * 1024)
+            entries.append((path, f"pkg/{name}"))
+        zip_path = self.temp_dir / "package.zip"
+
+        deploy.write_zip(zip_path, entries)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            compress_types = {
+                info.filename: info.compress_type for info in zipf.infolist()
+            }
+            self.assertEqual(zipf.read("pkg/native.so"), b"\0" * 1024)
+
+        self.assertEqual(
+            compress_types,
+            {
+                "pkg/module.py": zipfile.ZIP_DEFLATED,
+                "pkg/native.so": zipfile.ZIP_DEFLATED,
+                "pkg/bundled.whl": zipfile.ZIP_STORED,
+            },
+        )
+
+
+class TestCreateFunctionWithRetry(unittest.TestCase):
+    """Test cases for create_function_with_retry."""
+
+    def setUp(self):
+        """Mock the Lambda client and skip the backoff."""
+        for patcher in [
+            patch.object(deploy, "lambda_client"),
+            patch.object(deploy.time, "sleep"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.invalid_parameter = type(
+            "InvalidParameterValueException", (Exception,), {}
+        )
+        deploy.lambda_client.exceptions.InvalidParameterValueException = (
+            self.invalid_parameter
+        )
+        self.role_not_ready = self.invalid_parameter(
+            "The role defined for the function cannot be assumed by Lambda."
+        )
+
+    def test_retries_while_role_propagates(self):
+        """Test that creation is retried until the role can be assumed."""
+        deploy.lambda_client.create_function.side_effect = [
+            self.role_not_ready,
+            self.role_not_ready,
+            {"FunctionArn": "arn:function"},
+        ]
+
+        response = deploy.create_function_with_retry(FunctionName="function")
+
+        self.assertEqual(response, {"FunctionArn": "arn:function"})
+        self.assertEqual(
+            [call.args[0] for call in deploy.time.sleep.call_args_list], [1, 2]
+        )
+
+    def test_other_errors_are_raised(self):
+        """Test that unrelated invalid parameters are not retried."""
+        deploy.lambda_client.create_function.side_effect = self.invalid_parameter(
+            "Unsupported runtime"
+        )
+
+        with self.assertRaises(self.invalid_parameter):
+            deploy.create_function_with_retry(FunctionName="function")
+
+        deploy.time.sleep.assert_not_called()
+
+    def test_gives_up_after_retries(self):
+        """Test that the last propagation error is raised after all retries."""
+        deploy.lambda_client.create_function.side_effect = self.role_not_ready
+
+        with self.assertRaises(self.invalid_parameter):
+            deploy.create_function_with_retry(FunctionName="function")
+
+        self.assertEqual(
+            deploy.lambda_client.create_function.call_count,
+            deploy.ROLE_PROPAGATION_RETRIES,
+        )
+
+
+class TestDeployFunction(unittest.TestCase):
+    """Test cases for deploy_function."""
+
+    def setUp(self):
+        """Mock the Lambda client and the code location."""
+        lambda_patcher = patch.object(deploy, "lambda_client")
+        self.mock_lambda = lambda_patcher.start()
+        self.addCleanup(lambda_patcher.stop)
+        self.mock_lambda.exceptions.ResourceNotFoundException = type(
+            "ResourceNotFoundException", (Exception,), {}
+        )
+        self.mock_lambda.get_function.return_value = {
+            "Configuration": {"CodeSha256": "old", "FunctionArn": "arn:function"}
+        }
+        self.mock_lambda.update_function_code.return_value = {
+            "FunctionArn": "arn:function"
+        }
+
+        self.get_code = MagicMock(return_value={"ZipFile": b"zip"})
+
+    def test_unchanged_code_skips_package(self):
+        """Test that unchanged code neither reads nor uploads the package."""
+        arn = deploy.deploy_function("function", self.get_code, "old", "arn:role")
+
+        self.assertEqual(arn, "arn:function")
+        self.get_code.assert_not_called()
+        self.mock_lambda.update_function_code.assert_not_called()
+
+    def test_changed_code_is_updated(self):
+        """Test that changed code is uploaded and the update awaited."""
+        arn = deploy.deploy_function("function", self.get_code, "new", "arn:role")
+
+        self.assertEqual(arn, "arn:function")
+        self.mock_lambda.update_function_code.assert_called_once_with(
+            FunctionName="function", ZipFile=b"zip"
+        )
+        self.mock_lambda.get_waiter.assert_called_once_with("function_updated")
+
+    def test_upload_failure_returns_none(self):
+        """Test that a failed S3 upload is logged instead of raised."""
+        self.get_code.side_effect = S3UploadFailedError("upload failed")
+
+        with self.assertLogs(deploy.logger, level="ERROR"):
+            arn = deploy.deploy_function("function", self.get_code, "new", "arn:role")
+
+        self.assertIsNone(arn)
+
+    def test_waiter_failure_returns_none(self):
+        """Test that a failed code update is logged instead of raised."""
+        self.mock_lambda.get_waiter.return_value.wait.side_effect = WaiterError(
+            "FunctionUpdated", "failed", {}
+        )
+
+        with self.assertLogs(deploy.logger, level="ERROR"):
+            arn = deploy.deploy_function("function", self.get_code, "new", "arn:role")
+
+        self.assertIsNone(arn)
+
+
+class TestLazyPackageCode(unittest.TestCase):
+    """Test cases for lazy_package_code."""
+
+    def test_builds_code_location_once(self):
+        """Test that the code location is built on first use only."""
+        with patch.object(
+            deploy, "get_package_code", return_value={"ZipFile": b"zip"}
+        ) as mock_get_package_code:
+            get_code = deploy.lazy_package_code("package.zip", "sha")
+            mock_get_package_code.assert_not_called()
+
+            self.assertEqual(get_code(), {"ZipFile": b"zip"})
+            self.assertEqual(get_code(), {"ZipFile": b"zip"})
+
+        mock_get_package_code.assert_called_once_with("package.zip", "sha")
+
+
+class TestEventPermission(unittest.TestCase):
+    """Test cases for get_policy_statement_ids and create_event_rule."""
+
+    def setUp(self):
+        """Mock the Lambda and EventBridge clients."""
+        for patcher in [
+            patch.object(deploy, "lambda_client"),
+            patch.object(deploy, "events_client"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.not_found = type("ResourceNotFoundException", (Exception,), {})
+        deploy.lambda_client.exceptions.ResourceNotFoundException = self.not_found
+        deploy.events_client.put_rule.return_value = {"RuleArn": "arn:rule"}
+        self.statement_id = f"{deploy.LAMBDA_FUNCTION_NAME}-event-permission"
+
+    def set_policy_statements(self, *statement_ids):
+        """Make the function policy hold the given statement IDs."""
+        policy = {"Statement": [{"Sid": sid} for sid in statement_ids]}
+        deploy.lambda_client.get_policy.return_value = {"Policy": json.dumps(policy)}
+
+    def test_get_policy_statement_ids(self):
+        """Test that the statement IDs are read from the policy document."""
+        self.set_policy_statements("first", "second")
+
+        self.assertEqual(
+            deploy.get_policy_statement_ids("function"), {"first", "second"}
+        )
+
+    def test_get_policy_statement_ids_without_policy(self):
+        """Test that a function without a policy has no statements."""
+        deploy.lambda_client.get_policy.side_effect = self.not_found()
+
+        self.assertEqual(deploy.get_policy_statement_ids("function"), set())
+
+    def test_permission_added_once(self):
+        """Test that an existing permission is not added again."""
+        self.set_policy_statements(self.statement_id)
+
+        self.assertTrue(deploy.create_event_rule("arn:function"))
+
+        deploy.lambda_client.add_permission.assert_not_called()
+        deploy.events_client.put_targets.assert_called_once()
+
+    def test_missing_permission_is_added(self):
+        """Test that the permission is added when the policy lacks it."""
+        self.set_policy_statements("other")
+
+        self.assertTrue(deploy.create_event_rule("arn:function"))
+
+        deploy.lambda_client.add_permission.assert_called_once()
+        self.assertEqual(
+            deploy.lambda_client.add_permission.call_args.kwargs["StatementId"],
+            self.statement_id,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
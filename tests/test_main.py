@@ -0,0 +1,161 @@
+"""
+Tests for the main entry point.
+"""
+
+import asyncio
+import os
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# Add the src directory to the Python path
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The OpenAI client is created on import and requires an API key
+os.environ.setdefault("OPENAI_API_KEY", "test_api_key")
+
+from src import main as main_module
+
+
+def make_video(video_id):
+    """Build a video as returned by get_channel_videos_async."""
+    return {
+        "id": {"videoId": video_id},
+        "snippet": {"title": f"Video {video_id}", "channelTitle": "Test Channel"},
+    }
+
+
+def make_record(video_id):
+    """Build the record process_video returns for a processed video."""
+    return {"video_id": video_id, "channel_name": "Test Channel", "summary": "S"}
+
+
+class TestMain(unittest.IsolatedAsyncioTestCase):
+    """Test cases for main."""
+
+    def setUp(self):
+        """Mock the configuration, YouTube lookups, processing and DynamoDB."""
+        self.config = {
+            "channels": [
+                {"channel_id": "UC1", "name": "Channel 1"},
+                {"channel_id": "UC2", "name": "Channel 2"},
+            ],
+            "global_settings": {
+                "default_summary_style": "concise",
+                "default_summary_length": 500,
+                "default_include_timestamps": True,
+            },
+        }
+        self.channel_videos = {
+            "UC1": [make_video("a"), make_video("b")],
+            "UC2": [make_video("c")],
+        }
+
+        self.mock_process_video = AsyncMock(
+            side_effect=lambda video, *args: make_record(video["id"]["videoId"])
+        )
+        self.mock_mark = AsyncMock(return_value=True)
+        self.mock_filter = AsyncMock(side_effect=lambda video_ids: set(video_ids))
+
+        for patcher in [
+            patch.object(main_module, "refresh_config", return_value=self.config),
+            patch.object(main_module, "get_uploads_playlist_ids"),
+            patch.object(
+                main_module,
+                "get_channel_videos_async",
+                AsyncMock(
+                    side_effect=lambda channel_id, **kwargs: self.channel_videos[
+                        channel_id
+                    ]
+                ),
+            ),
+            patch.object(main_module, "filter_unprocessed_async", self.mock_filter),
+            patch.object(main_module, "process_video", self.mock_process_video),
+            patch.object(main_module, "mark_videos_as_processed_async", self.mock_mark),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def marked_video_ids(self):
+        """Return the IDs of all videos passed to the DynamoDB writes."""
+        return [
+            record["video_id"]
+            for call in self.mock_mark.await_args_list
+            for record in call.args[0]
+        ]
+
+    async def test_fans_out_across_channels(self):
+        """Test that new videos of all channels are processed with their channel."""
+        self.mock_filter.side_effect = lambda video_ids: {"a", "c"}
+        self.channel_videos["UC3"] = None
+        self.config["channels"].append({"channel_id": "UC3", "name": "Channel 3"})
+
+        await main_module.main()
+
+        self.mock_filter.assert_awaited_once_with(["a", "b", "c"])
+        processed = {
+            call.args[0]["id"]["videoId"]: call.args[1]["channel_id"]
+            for call in self.mock_process_video.await_args_list
+        }
+        self.assertEqual(processed, {"a": "UC1", "c": "UC2"})
+
+    async def test_processes_videos_concurrently(self):
+        """Test that all videos are in flight at once rather than per channel."""
+        started = 0
+        all_started = asyncio.Event()
+
+        async def process_video(video, *args):
+            nonlocal started
+            started += 1
+            if started == 3:
+                all_started.set()
+            await all_started.wait()
+            return make_record(video["id"]["videoId"])
+
+        self.mock_process_video.side_effect = process_video
+
+        await asyncio.wait_for(main_module.main(), timeout=5)
+
+        self.assertCountEqual(self.marked_video_ids(), ["a", "b", "c"])
+
+    async def test_marks_videos_as_they_finish(self):
+        """Test that a finished video is marked before slower ones complete."""
+        marked = asyncio.Event()
+        self.mock_mark.side_effect = lambda records: marked.set()
+
+        async def process_video(video, *args):
+            video_id = video["id"]["videoId"]
+            if video_id != "a":
+                # Only finish once the first video has been written
+                await marked.wait()
+            return make_record(video_id)
+
+        self.mock_process_video.side_effect = process_video
+
+        # Waiting for every video before the first write would never finish
+        await asyncio.wait_for(main_module.main(), timeout=5)
+
+        self.assertEqual(self.mock_mark.await_args_list[0].args[0], [make_record("a")])
+        self.assertCountEqual(self.marked_video_ids(), ["a", "b", "c"])
+
+    async def test_failed_video_does_not_block_others(self):
+        """Test that an exception in one video still marks the others."""
+
+        async def process_video(video, *args):
+            video_id = video["id"]["videoId"]
+            if video_id == "b":
+                raise RuntimeError("boom")
+            return make_record(video_id)
+
+        self.mock_process_video.side_effect = process_video
+
+        with self.assertLogs(main_module.logger, level="ERROR"):
+            await main_module.main()
+
+        self.assertCountEqual(self.marked_video_ids(), ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+Tests for the OpenAI service module.
+"""
+
+import json
+import os
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# Add the src directory to the Python path
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The OpenAI client is created on import and requires an API key
+os.environ.setdefault("OPENAI_API_KEY", "test_api_key")
+
+from src.services import openai_service
+from src.services.openai_service import (
+    condense_transcript,
+    generate_summary_and_tweet,
+    get_encoding,
+    split_transcript,
+)
+
+
+class FakeEncoding:
+    """An encoding with one token per character."""
+
+    def encode(self, text, disallowed_special="all"):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class TestSplitTranscript(unittest.TestCase):
+    """Test cases for get_encoding and split_transcript."""
+
+    def setUp(self):
+        """Clear the cached encodings and use small token budgets."""
+        openai_service._load_encoding.cache_clear()
+        self.addCleanup(openai_service._load_encoding.cache_clear)
+
+        for patcher in [
+            patch.object(openai_service, "MAX_TRANSCRIPT_TOKENS", 10),
+            patch.object(openai_service, "TRANSCRIPT_CHUNK_TOKENS", 4),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_short_transcript_is_not_split(self):
+        """Test that a transcript within the budget is returned whole."""
+        with patch.object(openai_service, "get_encoding", return_value=FakeEncoding()):
+            self.assertEqual(split_transcript("abcdefghij", "model"), ["abcdefghij"])
+
+    def test_long_transcript_is_split_by_tokens(self):
+        """Test that a long transcript is split into token chunks."""
+        with patch.object(openai_service, "get_encoding", return_value=FakeEncoding()):
+            chunks = split_transcript("abcdefghijk", "model")
+
+        self.assertEqual(chunks, ["abcd", "efgh", "ijk"])
+
+    def test_special_tokens_are_encoded_as_text(self):
+        """Test that special-token strings in a transcript do not raise."""
+        encoding = FakeEncoding()
+        with patch.object(encoding, "encode", return_value=[]) as mock_encode:
+            with patch.object(openai_service, "get_encoding", return_value=encoding):
+                split_transcript("<|endoftext|>", "model")
+
+        mock_encode.assert_called_once_with("<|endoftext|>", disallowed_special=())
+
+    def test_character_budget_without_encoding(self):
+        """Test that characters are counted when no encoding can be loaded."""
+        with patch.object(openai_service, "get_encoding", return_value=None):
+            chunks = split_transcript("a" * 41, "model")
+
+        chunk_chars = 4 * openai_service.CHARS_PER_TOKEN
+        self.assertEqual([len(chunk) for chunk in chunks], [chunk_chars] * 2 + [9])
+
+    def test_failed_encoding_load_is_not_cached(self):
+        """Test that a failed load is retried on the next call."""
+        encoding = FakeEncoding()
+        with patch.object(
+            openai_service.tiktoken,
+            "encoding_for_model",
+            side_effect=[OSError("offline"), encoding],
+        ):
+            with self.assertLogs(openai_service.logger, level="WARNING"):
+                self.assertIsNone(get_encoding("model"))
+            self.assertIs(get_encoding("model"), encoding)
+            self.assertIs(get_encoding("model"), encoding)
+
+
+class TestCondenseTranscript(unittest.IsolatedAsyncioTestCase):
+    """Test cases for condense_transcript."""
+
+    def setUp(self):
+        """Mock the chunk summary requests."""
+        self.mock_summarize = AsyncMock(
+            side_effect=lambda chunk, part, total: f"summary {part}/{total}"
+        )
+
+        summarize_patcher = patch.object(
+            openai_service, "summarize_chunk", self.mock_summarize
+        )
+        summarize_patcher.start()
+        self.addCleanup(summarize_patcher.stop)
+
+    async def test_short_transcript_is_unchanged(self):
+        """Test that a transcript that fits is returned without requests."""
+        with patch.object(openai_service, "split_transcript", return_value=["text"]):
+            self.assertEqual(await condense_transcript("text", "model"), "text")
+
+        self.mock_summarize.assert_not_awaited()
+
+    async def test_long_transcript_is_summarized_in_parts(self):
+        """Test that the chunk summaries are joined in order."""
+        with patch.object(
+            openai_service, "split_transcript", return_value=["one", "two"]
+        ):
+            result = await condense_transcript("one two", "model")
+
+        self.assertEqual(result, "summary 1/2\n\nsummary 2/2")
+
+    async def test_failed_part_fails_condensing(self):
+        """Test that a failed chunk summary returns None."""
+        self.mock_summarize.side_effect = ["summary", None]
+
+        with patch.object(
+            openai_service, "split_transcript", return_value=["one", "two"]
+        ):
+            with self.assertLogs(openai_service.logger, level="ERROR"):
+                self.assertIsNone(await condense_transcript("one two", "model"))
+
+
+class TestGenerateSummaryAndTweet(unittest.IsolatedAsyncioTestCase):
+    """Test cases for generate_summary_and_tweet."""
+
+    def setUp(self):
+        """Mock the OpenAI requests and pass transcripts through unchanged."""
+        self.mock_completion = AsyncMock()
+        self.mock_summary = AsyncMock(return_value="Fallback summary")
+        self.mock_tweet = AsyncMock(return_value="Fallback tweet")
+
+        for patcher in [
+            patch.object(openai_service, "OPENAI_API_KEY", "test_api_key"),
+            patch.object(openai_service, "create_completion", self.mock_completion),
+            patch.object(openai_service, "generate_summary", self.mock_summary),
+            patch.object(openai_service, "generate_tweet", self.mock_tweet),
+            patch.object(
+                openai_service,
+                "condense_transcript",
+                AsyncMock(side_effect=lambda transcript, model: transcript),
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_parses_json_response(self):
+        """Test that the summary and tweet are read from the JSON response."""
+        self.mock_completion.return_value = (
+            json.dumps({"summary": " The summary. ", "tweet": " The tweet. "}),
+            "stop",
+        )
+
+        summary, tweet = await generate_summary_and_tweet(
+            "transcript", "video123", channel_name="Test Channel"
+        )
+
+        self.assertEqual(summary, "The summary.")
+        self.assertEqual(tweet, "The tweet. https://youtu.be/video123 - Test Channel")
+        self.mock_summary.assert_not_called()
+
+    async def test_max_tokens_from_string_length(self):
+        """Test that a summary length given as a string sizes max_tokens."""
+        self.mock_completion.return_value = (
+            json.dumps({"summary": "The summary.", "tweet": "The tweet."}),
+            "stop",
+        )
+
+        await generate_summary_and_tweet("transcript", "video123", max_length="500")
+
+        self.assertEqual(
+            self.mock_completion.call_args.kwargs["max_tokens"],
+            500 * openai_service.SUMMARY_TOKENS_PER_WORD
+            + openai_service.TWEET_TOKEN_BUDGET,
+        )
+
+    async def test_missing_tweet(self):
+        """Test that a null tweet leaves only the summary."""
+        self.mock_completion.return_value = (
+            json.dumps({"summary": "The summary.", "tweet": None}),
+            "stop",
+        )
+
+        result = await generate_summary_and_tweet("transcript", "video123")
+
+        self.assertEqual(result, ("The summary.", None))
+
+    async def test_invalid_json_falls_back(self):
+        """Test that an unreadable response falls back to separate requests."""
+        self.mock_completion.return_value = ("not json", "stop")
+
+        result = await generate_summary_and_tweet("transcript", "video123")
+
+        self.assertEqual(result, ("Fallback summary", "Fallback tweet"))
+        self.mock_summary.assert_awaited_once()
+        self.mock_tweet.assert_awaited_once()
+
+    async def test_missing_summary_falls_back(self):
+        """Test that a response without a summary falls back to separate requests."""
+        self.mock_completion.return_value = (
+            json.dumps({"tweet": "The tweet."}),
+            "stop",
+        )
+
+        result = await generate_summary_and_tweet("transcript", "video123")
+
+        self.assertEqual(result, ("Fallback summary", "Fallback tweet"))
+
+    async def test_truncated_response_falls_back(self):
+        """Test that a response cut off at the token limit falls back."""
+        self.mock_completion.return_value = (
+            json.dumps({"summary": "The summary.", "tweet": "The tweet."}),
+            "length",
+        )
+
+        result = await generate_summary_and_tweet("transcript", "video123")
+
+        self.assertEqual(result, ("Fallback summary", "Fallback tweet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
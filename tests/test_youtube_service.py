@@ -2,7 +2,6 @@
 Tests for the YouTube service module.
 """
 
-import os
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -15,8 +14,10 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.services import youtube_service
 from src.services.youtube_service import (
     get_channel_videos,
+    get_uploads_playlist_ids,
     get_video_transcript,
     get_video_details,
     get_youtube_client,
@@ -26,64 +27,128 @@ from src.services.youtube_service import (
 class TestYoutubeService(unittest.TestCase):
     """Test cases for the YouTube service module."""
 
-    @patch("src.services.youtube_service.build")
-    def test_get_youtube_client_success(self, mock_build):
+    def setUp(self):
+        """Reset the cached YouTube clients and playlists and start the mocks."""
+        youtube_service._youtube_client = None
+        youtube_service._uploads_playlists.clear()
+        youtube_service._thread_local.__dict__.clear()
+
+        # Build the client from a mocked discovery service with a test key
+        build_patcher = patch("src.services.youtube_service.build")
+        self.mock_build = build_patcher.start()
+        self.addCleanup(build_patcher.stop)
+        self.mock_client = self.mock_build.return_value
+
+        api_key_patcher = patch.object(
+            youtube_service, "YOUTUBE_API_KEY", "test_api_key"
+        )
+        api_key_patcher.start()
+        self.addCleanup(api_key_patcher.stop)
+
+        transcript_api_patcher = patch(
+            "src.services.youtube_service.YouTubeTranscriptApi"
+        )
+        self.mock_transcript_api = transcript_api_patcher.start()
+        self.addCleanup(transcript_api_patcher.stop)
+
+    def test_get_youtube_client_success(self):
         """Test successful creation of YouTube client."""
-        # Set up the mock
-        mock_build.return_value = MagicMock()
+        # Call the function
+        client = get_youtube_client()
 
-        # Set environment variable
-        with patch.dict(os.environ, {"YOUTUBE_API_KEY": "test_api_key"}):
-            # Call the function
-            client = get_youtube_client()
+        # Verify the result
+        self.assertIs(client, self.mock_client)
+        self.mock_build.assert_called_once_with(
+            "youtube",
+            "v3",
+            developerKey="test_api_key",
+            cache_discovery=False,
+            static_discovery=True,
+        )
 
-            # Verify the result
-            self.assertIsNotNone(client)
-            mock_build.assert_called_once_with(
-                "youtube", "v3", developerKey="test_api_key"
-            )
+    def test_get_youtube_client_cached(self):
+        """Test that the YouTube client is only built once."""
+        # Call the function twice
+        first = get_youtube_client()
+        second = get_youtube_client()
 
-    @patch("src.services.youtube_service.build")
-    def test_get_youtube_client_no_api_key(self, mock_build):
-        """Test YouTube client creation with no API key."""
-        # Set up the mock
-        mock_build.return_value = MagicMock()
+        # Verify the result
+        self.assertIs(first, second)
+        self.mock_build.assert_called_once()
 
-        # Ensure the environment variable is not set
-        with patch.dict(os.environ, {}, clear=True):
+    def test_get_youtube_client_no_api_key(self):
+        """Test YouTube client creation with no API key."""
+        # Ensure the API key is not set
+        with patch.object(youtube_service, "YOUTUBE_API_KEY", None):
             # Call the function
             client = get_youtube_client()
 
             # Verify the result
             self.assertIsNone(client)
-            mock_build.assert_not_called()
+            self.mock_build.assert_not_called()
 
-    @patch("src.services.youtube_service.build")
-    def test_get_youtube_client_exception(self, mock_build):
+    def test_get_youtube_client_exception(self):
         """Test YouTube client creation with an exception."""
         # Set up the mock to raise an exception
-        mock_build.side_effect = Exception("Test exception")
+        self.mock_build.side_effect = Exception("Test exception")
 
-        # Set environment variable
-        with patch.dict(os.environ, {"YOUTUBE_API_KEY": "test_api_key"}):
-            # Call the function
-            client = get_youtube_client()
+        # Call the function
+        client = get_youtube_client()
 
-            # Verify the result
-            self.assertIsNone(client)
+        # Verify the result
+        self.assertIsNone(client)
+
+    def test_get_uploads_playlist_ids_batched(self):
+        """Test that uploads playlists are looked up in one batch and cached."""
+        # Set up the mock
+        mock_channels_list = MagicMock()
+        mock_channels_list.list.return_value.execute.return_value = {
+            "items": [
+                {
+                    "id": "channel_1",
+                    "contentDetails": {"relatedPlaylists": {"uploads": "uploads_1"}},
+                },
+                {
+                    "id": "channel_2",
+                    "contentDetails": {"relatedPlaylists": {"uploads": "uploads_2"}},
+                },
+            ]
+        }
+        self.mock_client.channels.return_value = mock_channels_list
 
-    @patch("src.services.youtube_service.get_youtube_client")
-    def test_get_channel_videos_success(self, mock_get_client):
+        # Call the function twice
+        playlists = get_uploads_playlist_ids(["channel_1", "channel_2"])
+        cached = get_uploads_playlist_ids(["channel_2"])
+
+        # Verify the result
+        self.assertEqual(
+            playlists, {"channel_1": "uploads_1", "channel_2": "uploads_2"}
+        )
+        self.assertEqual(cached, {"channel_2": "uploads_2"})
+        mock_channels_list.list.assert_called_once_with(
+            part="contentDetails",
+            id="channel_1,channel_2",
+            maxResults=50,
+            fields=youtube_service.CHANNEL_FIELDS,
+        )
+
+    def test_get_channel_videos_success(self):
         """Test successful retrieval of channel videos."""
         # Set up the mock
-        mock_client = MagicMock()
-        mock_search = MagicMock()
-        mock_search_list = MagicMock()
-        mock_search_list.list.return_value.execute.return_value = {
-            "items": [{"id": {"videoId": "test_video_id"}}]
+        youtube_service._uploads_playlists["test_channel_id"] = "test_uploads_id"
+        mock_playlist_items = MagicMock()
+        mock_playlist_items.list.return_value.execute.return_value = {
+            "items": [
+                {
+                    "snippet": {"title": "Test Video"},
+                    "contentDetails": {
+                        "videoId": "test_video_id",
+                        "videoPublishedAt": "2023-01-02T00:00:00Z",
+                    },
+                }
+            ]
         }
-        mock_client.search.return_value = mock_search_list
-        mock_get_client.return_value = mock_client
+        self.mock_client.playlistItems.return_value = mock_playlist_items
 
         # Call the function
         videos = get_channel_videos("test_channel_id")
@@ -91,25 +156,42 @@ class TestYoutubeService(unittest.TestCase):
         # Verify the result
         self.assertEqual(len(videos), 1)
         self.assertEqual(videos[0]["id"]["videoId"], "test_video_id")
-        mock_search_list.list.assert_called_once_with(
-            part="snippet",
-            channelId="test_channel_id",
+        self.assertEqual(videos[0]["snippet"]["title"], "Test Video")
+        mock_playlist_items.list.assert_called_once_with(
+            part="snippet,contentDetails",
+            playlistId="test_uploads_id",
             maxResults=5,
-            order="date",
-            type="video",
+            fields=youtube_service.PLAYLIST_ITEM_FIELDS,
         )
 
-    @patch("src.services.youtube_service.get_youtube_client")
-    def test_get_channel_videos_with_published_after(self, mock_get_client):
-        """Test retrieval of channel videos with publishedAfter parameter."""
+    def test_get_channel_videos_with_published_after(self):
+        """Test that videos published before publishedAfter are filtered out."""
         # Set up the mock
-        mock_client = MagicMock()
-        mock_search_list = MagicMock()
-        mock_search_list.list.return_value.execute.return_value = {
-            "items": [{"id": {"videoId": "test_video_id"}}]
+        youtube_service._uploads_playlists["test_channel_id"] = "test_uploads_id"
+        mock_playlist_items = MagicMock()
+        mock_playlist_items.list.return_value.execute.return_value = {
+            "items": [
+                {
+                    "snippet": {"title": "New Video"},
+                    "contentDetails": {
+                        "videoId": "new_video_id",
+                        "videoPublishedAt": "2023-01-02T00:00:00Z",
+                    },
+                },
+                {
+                    "snippet": {"title": "Old Video"},
+                    "contentDetails": {
+                        "videoId": "old_video_id",
+                        "videoPublishedAt": "2022-12-31T00:00:00Z",
+                    },
+                },
+                {
+                    "snippet": {"title": "Private video"},
+                    "contentDetails": {"videoId": "private_video_id"},
+                },
+            ]
         }
-        mock_client.search.return_value = mock_search_list
-        mock_get_client.return_value = mock_client
+        self.mock_client.playlistItems.return_value = mock_playlist_items
 
         # Call the function
         videos = get_channel_videos(
@@ -117,39 +199,33 @@ class TestYoutubeService(unittest.TestCase):
         )
 
         # Verify the result
-        self.assertEqual(len(videos), 1)
-        mock_search_list.list.assert_called_once_with(
-            part="snippet",
-            channelId="test_channel_id",
+        self.assertEqual([v["id"]["videoId"] for v in videos], ["new_video_id"])
+        mock_playlist_items.list.assert_called_once_with(
+            part="snippet,contentDetails",
+            playlistId="test_uploads_id",
             maxResults=3,
-            order="date",
-            type="video",
-            publishedAfter="2023-01-01T00:00:00Z",
+            fields=youtube_service.PLAYLIST_ITEM_FIELDS,
         )
 
-    @patch("src.services.youtube_service.get_youtube_client")
-    def test_get_channel_videos_no_client(self, mock_get_client):
+    def test_get_channel_videos_no_client(self):
         """Test retrieval of channel videos with no client."""
-        # Set up the mock
-        mock_get_client.return_value = None
-
-        # Call the function
-        videos = get_channel_videos("test_channel_id")
+        # Ensure the client cannot be created
+        with patch.object(youtube_service, "YOUTUBE_API_KEY", None):
+            # Call the function
+            videos = get_channel_videos("test_channel_id")
 
         # Verify the result
         self.assertIsNone(videos)
 
-    @patch("src.services.youtube_service.get_youtube_client")
-    def test_get_channel_videos_http_error(self, mock_get_client):
+    def test_get_channel_videos_http_error(self):
         """Test retrieval of channel videos with HTTP error."""
         # Set up the mock
-        mock_client = MagicMock()
-        mock_search_list = MagicMock()
-        mock_search_list.list.return_value.execute.side_effect = HttpError(
+        youtube_service._uploads_playlists["test_channel_id"] = "test_uploads_id"
+        mock_playlist_items = MagicMock()
+        mock_playlist_items.list.return_value.execute.side_effect = HttpError(
             resp=MagicMock(status=403), content=b'{"error": {"message": "Test error"}}'
         )
-        mock_client.search.return_value = mock_search_list
-        mock_get_client.return_value = mock_client
+        self.mock_client.playlistItems.return_value = mock_playlist_items
 
         # Call the function
         videos = get_channel_videos("test_channel_id")
@@ -157,18 +233,17 @@ class TestYoutubeService(unittest.TestCase):
         # Verify the result
         self.assertIsNone(videos)
 
-    @patch("src.services.youtube_service.YouTubeTranscriptApi")
-    def test_get_video_transcript_success(self, mock_transcript_api):
+    def test_get_video_transcript_success(self):
         """Test successful retrieval of video transcript."""
         # Set up the mock
         mock_transcript_list = MagicMock()
         mock_transcript = MagicMock()
         mock_transcript.fetch.return_value = [
-            {"text": "This is a test transcript."},
-            {"text": "It has multiple entries."},
+            MagicMock(text="This is a test transcript."),
+            MagicMock(text="It has multiple entries."),
         ]
         mock_transcript_list.find_transcript.return_value = mock_transcript
-        mock_transcript_api.list_transcripts.return_value = mock_transcript_list
+        self.mock_transcript_api.return_value.list.return_value = mock_transcript_list
 
         # Call the function
         transcript = get_video_transcript("test_video_id")
@@ -177,20 +252,40 @@ class TestYoutubeService(unittest.TestCase):
         self.assertEqual(
             transcript, "This is a test transcript. It has multiple entries."
         )
-        mock_transcript_api.list_transcripts.assert_called_once_with("test_video_id")
+        self.mock_transcript_api.return_value.list.assert_called_once_with(
+            "test_video_id"
+        )
         mock_transcript_list.find_transcript.assert_called_once_with(["en"])
 
-    @patch("src.services.youtube_service.get_youtube_client")
-    def test_get_video_details_success(self, mock_get_client):
+    def test_get_video_transcript_skips_noise(self):
+        """Test that empty and noise fragments are left out of the transcript."""
+        # Set up the mock
+        mock_transcript_list = MagicMock()
+        mock_transcript = MagicMock()
+        mock_transcript.fetch.return_value = [
+            MagicMock(text="[Music]"),
+            MagicMock(text="Welcome back."),
+            MagicMock(text=" "),
+            MagicMock(text="[Applause]"),
+            MagicMock(text="Let's begin."),
+        ]
+        mock_transcript_list.find_transcript.return_value = mock_transcript
+        self.mock_transcript_api.return_value.list.return_value = mock_transcript_list
+
+        # Call the function
+        transcript = get_video_transcript("test_video_id")
+
+        # Verify the result
+        self.assertEqual(transcript, "Welcome back. Let's begin.")
+
+    def test_get_video_details_success(self):
         """Test successful retrieval of video details."""
         # Set up the mock
-        mock_client = MagicMock()
         mock_videos_list = MagicMock()
         mock_videos_list.list.return_value.execute.return_value = {
             "items": [{"id": "test_video_id", "snippet": {"title": "Test Video"}}]
         }
-        mock_client.videos.return_value = mock_videos_list
-        mock_get_client.return_value = mock_client
+        self.mock_client.videos.return_value = mock_videos_list
 
         # Call the function
         video_details = get_video_details("test_video_id")
@@ -199,7 +294,9 @@ class TestYoutubeService(unittest.TestCase):
         self.assertEqual(video_details["id"], "test_video_id")
         self.assertEqual(video_details["snippet"]["title"], "Test Video")
         mock_videos_list.list.assert_called_once_with(
-            part="snippet,contentDetails,statistics", id="test_video_id"
+            part="snippet,contentDetails,statistics",
+            id="test_video_id",
+            fields=youtube_service.VIDEO_DETAILS_FIELDS,
         )
 
 